@@ -5,10 +5,14 @@ This module provides functionality to load, validate, and preprocess
 configuration files for EdgePrompt experiments.
 """
 
+import copy
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from .json_utils import json_loads
 
 # TODO: Implement full JSON schema validation against PROMPT_ENGINEERING.md schemas
 #       using a library like jsonschema for enhanced robustness.
@@ -52,7 +56,38 @@ class ConfigLoader:
         self.logger.info(f"Initialized ConfigLoader. Test Suite: {config_path}. Base dir for suite: {self.base_dir}")
         self.logger.debug(f"Templates dir: {self._templates_dir}")
         self.logger.debug(f"Configs dir: {self._configs_dir}")
+
+        # Parsed JSON config files keyed by path, with the file modification time they were read at
+        self._json_cache: Dict[str, Tuple[int, Any]] = {}
+        self._json_cache_lock = threading.Lock()
     
+    def _read_json_file(self, file_path: str) -> Any:
+        """
+        Read and parse a JSON config file. The parsed content is reused until the file's
+        modification time changes, so repeated lookups (e.g. a validation sequence loaded
+        for every run) do not re-read the file.
+
+        Args:
+            file_path: Path to the JSON file.
+
+        Returns:
+            A deep copy of the parsed content, which callers may modify freely.
+
+        Raises:
+            FileNotFoundError, json.JSONDecodeError: As for open() and json_loads().
+        """
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        with self._json_cache_lock:
+            cached = self._json_cache.get(file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            data = cached[1]
+        else:
+            with open(file_path, 'rb') as f:
+                data = json_loads(f.read()) # orjson when available
+            with self._json_cache_lock:
+                self._json_cache[file_path] = (mtime_ns, data)
+        return copy.deepcopy(data)
+
     def load_test_suite(self) -> Dict[str, Any]:
         """
         Load the main test suite configuration file.
@@ -125,11 +160,10 @@ class ConfigLoader:
             The dictionary matching the item_id, or None if not found or error occurs.
         """
         try:
-            with open(file_path, 'r') as f:
-                config_list = json.load(f)
-                if not isinstance(config_list, list):
-                    self.logger.error(f"Expected a list in config file {file_path}, found {type(config_list)}")
-                    return None
+            config_list = self._read_json_file(file_path)
+            if not isinstance(config_list, list):
+                self.logger.error(f"Expected a list in config file {file_path}, found {type(config_list)}")
+                return None
 
             for item in config_list:
                 if isinstance(item, dict) and item.get(id_field) == item_id:
@@ -177,8 +211,7 @@ class ConfigLoader:
         self.logger.debug(f"Attempting to load model config: {model_id} from {self._model_configs_file}")
         
         try:
-            with open(self._model_configs_file, 'r') as f:
-                model_data = json.load(f)
+            model_data = self._read_json_file(self._model_configs_file)
 
             if not isinstance(model_data, dict):
                 self.logger.error(f"Expected a dictionary in {self._model_configs_file}, found {type(model_data)}")
@@ -232,15 +265,14 @@ class ConfigLoader:
         self.logger.debug(f"Attempting to load template: {template_path}")
 
         try:
-            with open(template_path, 'r') as f:
-                template_data = json.load(f)
-                # Basic validation: Check for 'id' and 'pattern' which are essential
-                if not isinstance(template_data, dict) or \
-                   'id' not in template_data or \
-                   'pattern' not in template_data:
-                    self.logger.error(f"Invalid template structure or missing 'id'/'pattern' key in {template_path}")
-                    return None
-                return template_data
+            template_data = self._read_json_file(template_path)
+            # Basic validation: Check for 'id' and 'pattern' which are essential
+            if not isinstance(template_data, dict) or \
+               'id' not in template_data or \
+               'pattern' not in template_data:
+                self.logger.error(f"Invalid template structure or missing 'id'/'pattern' key in {template_path}")
+                return None
+            return template_data
         except FileNotFoundError:
             self.logger.error(f"Template file not found: {template_path}")
             return None
@@ -268,38 +300,37 @@ class ConfigLoader:
         self.logger.debug(f"Attempting to load validation sequence: {sequence_path}")
 
         try:
-            with open(sequence_path, 'r') as f:
-                sequence_data = json.load(f)
-                
-                # Validation sequence-specific validation
-                if not isinstance(sequence_data, dict):
-                    self.logger.error(f"Invalid validation sequence: not a dictionary in {sequence_path}")
+            sequence_data = self._read_json_file(sequence_path)
+            
+            # Validation sequence-specific validation
+            if not isinstance(sequence_data, dict):
+                self.logger.error(f"Invalid validation sequence: not a dictionary in {sequence_path}")
+                return None
+            
+            # Check essential fields for a validation sequence
+            if 'id' not in sequence_data:
+                self.logger.error(f"Invalid validation sequence: missing 'id' in {sequence_path}")
+                return None
+            
+            if 'stages' not in sequence_data or not isinstance(sequence_data['stages'], list):
+                self.logger.error(f"Invalid validation sequence: missing or invalid 'stages' array in {sequence_path}")
+                return None
+            
+            # Check that each stage has required fields
+            for i, stage in enumerate(sequence_data['stages']):
+                if not isinstance(stage, dict):
+                    self.logger.error(f"Invalid validation stage at index {i}: not a dictionary")
                     return None
-                
-                # Check essential fields for a validation sequence
-                if 'id' not in sequence_data:
-                    self.logger.error(f"Invalid validation sequence: missing 'id' in {sequence_path}")
+                if 'id' not in stage:
+                    self.logger.error(f"Invalid validation stage at index {i}: missing 'id'")
                     return None
-                
-                if 'stages' not in sequence_data or not isinstance(sequence_data['stages'], list):
-                    self.logger.error(f"Invalid validation sequence: missing or invalid 'stages' array in {sequence_path}")
+                if 'template_id' not in stage:
+                    self.logger.error(f"Invalid validation stage at index {i}: missing 'template_id'")
                     return None
-                
-                # Check that each stage has required fields
-                for i, stage in enumerate(sequence_data['stages']):
-                    if not isinstance(stage, dict):
-                        self.logger.error(f"Invalid validation stage at index {i}: not a dictionary")
-                        return None
-                    if 'id' not in stage:
-                        self.logger.error(f"Invalid validation stage at index {i}: missing 'id'")
-                        return None
-                    if 'template_id' not in stage:
-                        self.logger.error(f"Invalid validation stage at index {i}: missing 'template_id'")
-                        return None
-                
-                self.logger.debug(f"Successfully loaded validation sequence '{sequence_data['id']}' with {len(sequence_data['stages'])} stages")
-                return sequence_data
-                
+            
+            self.logger.debug(f"Successfully loaded validation sequence '{sequence_data['id']}' with {len(sequence_data['stages'])} stages")
+            return sequence_data
+            
         except FileNotFoundError:
             self.logger.error(f"Validation sequence file not found: {sequence_path}")
             return None
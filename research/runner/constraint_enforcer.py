@@ -7,7 +7,10 @@ prohibited keywords, and topic relevance for the EdgePrompt framework.
 
 import logging
 import re
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+# Word tokenizer shared by the word count and topic checks
+WORD_PATTERN = re.compile(r'\b\w+\b')
 
 class ConstraintEnforcer:
     """
@@ -20,11 +23,17 @@ class ConstraintEnforcer:
     - Prohibited keywords (case-insensitive, whole word)
     - Required topics (basic keyword overlap heuristic)
     - Basic format checks (e.g., JSON start/end markers)
+
+    Prohibited-keyword hits are reported as *fatal*: no amount of LLM validation can
+    make disallowed content acceptable, so callers may skip the expensive steps.
     """
     
     def __init__(self):
         """Initialize the ConstraintEnforcer"""
         self.logger = logging.getLogger("edgeprompt.runner.constraints")
+        # Compiled keyword patterns, keyed by keyword (or keyword tuple for combined patterns).
+        # Constraint sets come from config, so they repeat across runs.
+        self._pattern_cache: Dict[Any, re.Pattern] = {}
         self.logger.info("ConstraintEnforcer initialized")
     
     def enforce_constraints(self, content: str, constraints: Dict[str, Any]) -> Dict[str, Any]:
@@ -38,17 +47,20 @@ class ConstraintEnforcer:
                          prohibitedKeywords: ["badword"], requiredTopic: "roots"}).
 
         Returns:
-            Dict containing results: {'passed': bool, 'violations': list[str]}
+            Dict containing results: {'passed': bool, 'fatal': bool, 'violations': list[str]}.
+            'fatal' is True when a violation (e.g., prohibited content) cannot be
+            outweighed by a good validation score.
         """
         if not isinstance(content, str):
             self.logger.warning("ConstraintEnforcer received non-string content, cannot enforce.")
-            return {"passed": False, "violations": ["Input content was not a string."]}
+            return {"passed": False, "fatal": False, "violations": ["Input content was not a string."]}
         
         self.logger.debug(f"Enforcing constraints on content (length: {len(content)}). Constraints: {constraints.keys()}")
         
         # Initialize result
         enforcement_result = {
             "passed": True,
+            "fatal": False,
             "violations": []
         }
         
@@ -72,10 +84,11 @@ class ConstraintEnforcer:
         
         # Prohibited keywords check
         prohibited_keywords = constraints.get("prohibitedKeywords")
-        if isinstance(prohibited_keywords, list):
+        if isinstance(prohibited_keywords, list) and self._contains_any_keyword(content, prohibited_keywords):
             for keyword in prohibited_keywords:
                 if isinstance(keyword, str) and self._contains_keyword(content, keyword):
                     enforcement_result["passed"] = False
+                    enforcement_result["fatal"] = True # Disallowed content
                     violation_msg = f"Prohibited keyword '{keyword}' found"
                     enforcement_result["violations"].append(violation_msg)
                     self.logger.debug(f"Constraint violation: {violation_msg}")
@@ -114,12 +127,31 @@ class ConstraintEnforcer:
     def _count_words(self, text: str) -> int:
         """Counts words using regex for word boundaries."""
         if not isinstance(text, str): return 0
-        return len(re.findall(r'\b\w+\b', text))
+        return sum(1 for _ in WORD_PATTERN.finditer(text))
+    
+    def _get_keyword_pattern(self, keywords: Tuple[str, ...]) -> re.Pattern:
+        """Returns the cached whole-word, case-insensitive pattern matching any of the keywords."""
+        pattern = self._pattern_cache.get(keywords)
+        if pattern is None:
+            alternation = "|".join(re.escape(keyword) for keyword in keywords)
+            pattern = self._pattern_cache.setdefault(
+                keywords, re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+            )
+        return pattern
     
     def _contains_keyword(self, text: str, keyword: str) -> bool:
         """Checks if text contains keyword (case-insensitive, whole word only)."""
-        """Check if text contains keyword (case-insensitive)"""
-        return re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE) is not None
+        return self._get_keyword_pattern((keyword,)).search(text) is not None
+    
+    def _contains_any_keyword(self, text: str, keywords: List[Any]) -> bool:
+        """
+        Single-pass pre-check: True if text contains any of the keywords.
+        Lets the common no-violation case skip the per-keyword scans.
+        """
+        keywords = tuple(keyword for keyword in keywords if isinstance(keyword, str))
+        if not keywords:
+            return False
+        return self._get_keyword_pattern(keywords).search(text) is not None
     
     def _topic_is_present(self, text: str, topic: str) -> bool:
         """
@@ -129,7 +161,7 @@ class ConstraintEnforcer:
         this might use embeddings or more sophisticated NLP techniques.
         """
         # Split topic into keywords
-        keywords = re.findall(r'\b\w+\b', topic.lower())
+        keywords = WORD_PATTERN.findall(topic.lower())
         
         # Count how many topic keywords appear in the text
         text_lower = text.lower()
@@ -6,6 +6,7 @@ against expected results and validation criteria, using both
 edge LLMs (via multi-stage validation) and external LLMs (Anthropic Claude).
 """
 
+import concurrent.futures
 import logging
 import json
 import time
@@ -34,6 +35,9 @@ class EvaluationEngine:
     - Structured output parsing
     """
     
+    # Upper bound on concurrent LLM calls when a sequence sets "parallelStages"
+    MAX_PARALLEL_STAGES = 4
+    
     def __init__(self, template_engine: TemplateEngine, metrics_collector: MetricsCollector,
                  anthropic_api_key: Optional[str] = None):
         """
@@ -105,7 +109,7 @@ class EvaluationEngine:
             "aggregateFeedback": "",
             "total_validation_metrics": {} # To store aggregated metrics
         }
-        all_stage_metrics = []
+        metrics_accumulator = self.metrics_collector.new_accumulator()
 
         # Sort stages by priority (descending, higher first)
         # Default priority to 0 if missing
@@ -150,12 +154,12 @@ class EvaluationEngine:
                 if llm_s_result.get("error"):
                      raise RuntimeError(f"LLM-S execution error: {llm_s_result['error']}")
 
-                generated_text = llm_s_result.get("generated_text", "")
+                generated_text = self._get_output_text(llm_s_result)
                 parsed_stage_data = self._parse_json_from_llm_output(generated_text)
 
                 # Get metrics from the LLM result
                 stage_metrics = llm_s_result.get("metrics", {})
-                all_stage_metrics.append(stage_metrics)
+                metrics_accumulator.add(stage_metrics)
 
             except Exception as e:
                 self.logger.error(f"Error executing or parsing validation stage {stage_id}: {e}", exc_info=True)
@@ -204,11 +208,19 @@ class EvaluationEngine:
         # validation_result["finalScore"] = max(0.0, min(validation_result["finalScore"], max_possible_score)) 
 
         # Aggregate metrics from all stages run
-        validation_result["total_validation_metrics"] = self.metrics_collector.merge_metrics(all_stage_metrics)
+        validation_result["total_validation_metrics"] = metrics_accumulator.finalize()
 
         self.logger.info(f"Multi-stage validation complete. Overall Valid: {validation_result['isValid']}, Final Score: {validation_result['finalScore']:.2f}")
         return validation_result
     
+    @staticmethod
+    def _get_output_text(llm_result: Dict[str, Any]) -> str:
+        """
+        Returns the text of an executor result: EdgeLLM results use "generated_text",
+        CloudLLM results use "llm_output".
+        """
+        return llm_result.get("generated_text") or llm_result.get("llm_output") or ""
+
     def _parse_json_from_llm_output(self, text: str) -> Dict[str, Any]:
         """
         Robustly extracts and parses JSON from LLM output text.
@@ -230,7 +242,7 @@ class EvaluationEngine:
         }
         
         # If input is empty or not a string, we can't parse it
-        if not text or not isinstance(text, str) or text.strip() == "":
+        if not text or not isinstance(text, str) or text.isspace():
             self.logger.warning("Received empty or non-string output for JSON parsing.")
             raise ValueError("VALIDATION ERROR: Received empty output for JSON parsing.")
         
@@ -324,13 +336,64 @@ Provide your evaluation in JSON format with the following keys:
         self.logger.info(f"LLM proxy evaluation complete. Passed: {result.get('passed')}, Score: {result.get('score')}")
         return result 
 
+    @staticmethod
+    def _build_stage_vars(question: str, answer: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Builds the template variables shared by every validation stage."""
+        stage_vars = {
+            'question': question, 
+            'answer': answer
+        }
+        
+        # Add context variables if available
+        if context:
+            stage_vars.update(context)
+        return stage_vars
+    
+    def _prepare_stage_prompts(self, stages: List[Dict[str, Any]], question: str, answer: str,
+                               context: Optional[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Renders the prompt of every independent stage up front (for parallel/batched execution).
+        Stages with "dependsOn" need earlier stage results and are left out, as are stages whose
+        template is missing or fails to render; the sequential pass in validate_with_sequence
+        runs the former and reports errors for the latter.
+        """
+        stage_prompts = {}
+        for stage_index, stage in enumerate(stages):
+            template_id = stage.get("template_id")
+            if not template_id or stage.get("dependsOn"):
+                continue
+            try:
+                prompt, _ = self.template_engine.process_template(
+                    template_id, self._build_stage_vars(question, answer, context)
+                )
+            except Exception:
+                continue
+            if prompt is not None:
+                stage_prompts[stage_index] = prompt
+        return stage_prompts
+    
+    @staticmethod
+    def _build_dependency_feedback(stage: Dict[str, Any], stage_results: List[Dict[str, Any]]) -> str:
+        """Joins the feedback of the stages listed in a stage's "dependsOn" (in completion order)."""
+        dependencies = set(stage.get("dependsOn") or [])
+        return "\n".join(
+            f"[{result.get('stageId')}] {result.get('feedback', '')}"
+            for result in stage_results if result.get("stageId") in dependencies
+        )
+    
     def validate_with_sequence(self, question: str, answer: str, 
                             context: Optional[Dict[str, Any]],
                             validation_sequence_id: str,
-                            llm_executor: Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+                            llm_executor: Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]],
+                            batch_executor: Optional[Callable[[List[str], Optional[Dict[str, Any]]], List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """
         Apply a validation sequence using an Edge LLM (LLM-S) by loading the sequence from its ID.
         This is a wrapper around validate_result that first loads the validation sequence.
+        If the sequence sets "parallelStages", the LLM calls of all independent stages are issued
+        together: as a single batch_executor call when one is given, otherwise concurrently
+        through llm_executor (which must then be safe to call from multiple threads). A stage
+        that lists earlier stage ids in "dependsOn" runs after them instead, with their
+        feedback available to its template as {{dependency_feedback}}.
         
         Args:
             question: The original question prompt content.
@@ -338,6 +401,8 @@ Provide your evaluation in JSON format with the following keys:
             context: The context data (e.g., teacher request containing constraints/rubric).
             validation_sequence_id: ID of the validation sequence to load.
             llm_executor: Callable that executes the LLM model with a prompt and params.
+            batch_executor: Optional callable that executes a list of prompts in one call and
+                returns one result per prompt (used with "parallelStages").
             
         Returns:
             Dict containing validation results: {isValid, finalScore, stageResults, aggregateFeedback, metrics}.
@@ -362,8 +427,8 @@ Provide your evaluation in JSON format with the following keys:
         
         self.logger.info(f"Loaded validation sequence '{validation_sequence_id}' with {len(validation_stages)} stages")
         
-        # Collect metrics from all validation stages
-        all_metrics = []
+        # Sum metrics from all validation stages as they complete
+        metrics_accumulator = self.metrics_collector.new_accumulator()
         
         # Sort stages by priority (descending, higher first)
         # Default priority to 0 if missing
@@ -378,20 +443,50 @@ Provide your evaluation in JSON format with the following keys:
             "metrics": {}  # To store aggregated metrics
         }
         
+        # Parameters for validation: low temp, ensure JSON output
+        params = {
+            "temperature": 0.1,
+            "max_tokens": 512,  # Allow enough tokens for JSON + feedback
+            "response_format": {"type": "json_object"}  # Request JSON output
+        }
+        
+        # Independent stages only need the question/answer/context, so with "parallelStages"
+        # their LLM calls are issued up front and the results are consumed in priority order.
+        # With abortOnFailure, calls for stages after a failure are discarded (or cancelled).
+        stage_futures: Dict[int, concurrent.futures.Future] = {}
+        stage_batch_results: Dict[int, Dict[str, Any]] = {}
+        stage_pool = None
+        if validation_sequence_config.get("parallelStages", False) and len(sorted_stages) > 1:
+            stage_prompts = self._prepare_stage_prompts(sorted_stages, question, answer, context)
+            if batch_executor is not None and stage_prompts:
+                stage_indices = list(stage_prompts)
+                try:
+                    batch_results = batch_executor([stage_prompts[i] for i in stage_indices], params)
+                    stage_batch_results = dict(zip(stage_indices, batch_results))
+                    self.logger.debug(f"Executed {len(stage_batch_results)} validation stages as one batch")
+                except Exception as e:
+                    # Fall back to issuing each stage's call individually below
+                    self.logger.warning(f"Batched validation call failed, running stages individually: {e}")
+            else:
+                stage_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(len(sorted_stages), self.MAX_PARALLEL_STAGES),
+                    thread_name_prefix="validation-stage"
+                )
+                for stage_index, prompt in stage_prompts.items():
+                    stage_futures[stage_index] = stage_pool.submit(llm_executor, prompt, params)
+                self.logger.debug(f"Submitted {len(stage_futures)} validation stages concurrently")
+        
         # Process each validation stage
-        for stage in sorted_stages:
+        for stage_index, stage in enumerate(sorted_stages):
             stage_id = stage.get("id", "unknown_stage")
             self.logger.debug(f"Running validation stage: {stage_id}")
             
             # Prepare stage variables
-            stage_vars = {
-                'question': question, 
-                'answer': answer
-            }
-            
-            # Add context variables if available
-            if context:
-                stage_vars.update(context)
+            stage_vars = self._build_stage_vars(question, answer, context)
+            if stage.get("dependsOn"):
+                stage_vars["dependency_feedback"] = self._build_dependency_feedback(
+                    stage, validation_result["stageResults"]
+                )
             
             # Get the template ID for this stage
             template_id = stage.get("template_id")
@@ -435,23 +530,21 @@ Provide your evaluation in JSON format with the following keys:
                 continue  # Skip this stage
             
             # Execute LLM for validation
-            # Parameters for validation: low temp, ensure JSON output
-            params = {
-                "temperature": 0.1,
-                "max_tokens": 512,  # Allow enough tokens for JSON + feedback
-                "response_format": {"type": "json_object"}  # Request JSON output
-            }
-            
             try:
-                # Call the executor function
-                llm_result = llm_executor(validation_prompt, params)
+                # Call the executor function (or collect the call already issued for this stage)
+                if stage_index in stage_batch_results:
+                    llm_result = stage_batch_results[stage_index]
+                elif stage_index in stage_futures:
+                    llm_result = stage_futures[stage_index].result()
+                else:
+                    llm_result = llm_executor(validation_prompt, params)
                 
                 # Extract metrics
                 stage_metrics = llm_result.get("metrics", {})
-                all_metrics.append(stage_metrics)
+                metrics_accumulator.add(stage_metrics)
                 
                 # Parse the result
-                generated_text = llm_result.get("generated_text", "")
+                generated_text = self._get_output_text(llm_result)
                 parsed_result = self._parse_json_from_llm_output(generated_text)
                 
                 # Check if parsing succeeded
@@ -515,6 +608,12 @@ Provide your evaluation in JSON format with the following keys:
                 if validation_sequence_config.get("abortOnFailure", True):
                     break
         
+        if stage_pool is not None:
+            # Drop calls for stages skipped by abortOnFailure without waiting for them
+            for future in stage_futures.values():
+                future.cancel()
+            stage_pool.shutdown(wait=False)
+        
         # Normalize the final score if needed
         # Get total weight of all stages
         total_weight = sum(stage.get("weight", 1.0) for stage in sorted_stages)
@@ -527,6 +626,6 @@ Provide your evaluation in JSON format with the following keys:
             validation_result["isValid"] = False
         
         # Merge all metrics
-        validation_result["metrics"] = self.metrics_collector.merge_metrics([m for m in all_metrics if m])
+        validation_result["metrics"] = metrics_accumulator.finalize()
         
         return validation_result 
\ No newline at end of file
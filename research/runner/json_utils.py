@@ -5,58 +5,239 @@ This module provides robust JSON parsing functions for handling model outputs,
 including extracting JSON from markdown blocks and repairing malformed JSON.
 """
 
+import copy
+import functools
 import json
 import logging
 import re
-from typing import Dict, Any, Optional, Tuple, List, Callable, Union
+from typing import Dict, Any, Optional, Tuple, List, Callable, Union, Iterator
+
+# Optional fast JSON parser; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up module-level logger
 logger = logging.getLogger("edgeprompt.runner.json_utils")
 
-def extract_json_from_text(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+# Number of distinct texts whose JSON extraction result is memoized
+EXTRACTION_CACHE_SIZE = 1024
+
+# Extraction patterns tried in order by extract_json_from_text, compiled once at import.
+# Each pattern is only searched if its required substring occurs in the text (a cheap
+# str containment check), e.g. the markdown patterns are skipped for fence-free output.
+_EXTRACTION_PATTERNS = [
+    # Code blocks with or without language specifier
+    (re.compile(r'```(?:json)?\s*([\s\S]*?)```', re.DOTALL), "markdown_code_block", "```"),
+    (re.compile(r'```\s*([\s\S]*?)```', re.DOTALL), "markdown_code_block", "```"),
+    
+    # Single backtick code (inline code)
+    (re.compile(r'`([\s\S]*?)`', re.DOTALL), "inline_code", "`"),
+    
+    # Just a JSON object in the text
+    (re.compile(r'(\{[\s\S]*?\})', re.DOTALL), "json_object", "{"),
+    
+    # Key-value pairs (output of some models)
+    (re.compile(r'(?:[\r\n]|^)((?:(?:"?[a-zA-Z_][a-zA-Z0-9_]*"?\s*:\s*(?:"[^"]*"|\'[^\']*\'|true|false|null|-?\d+(?:\.\d+)?|undefined)[\s,]*)+))', re.DOTALL), "key_value_pairs", ":")
+]
+
+# Clean-up patterns for malformed JSON
+_SINGLE_QUOTED_RE = re.compile(r'\'([^\']*?)\'')
+_UNQUOTED_KEY_RE = re.compile(r'([{,])\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:')
+_TRAILING_COMMA_RE = re.compile(r',(?=\s*[}\]])')
+_CODE_FENCE_RE = re.compile(r'```(?:json)?')
+# Python literals outside string literals; quoted strings (either quote style, honoring escapes)
+# are matched as a whole so literals inside them are left alone
+_PYTHON_LITERAL_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\'|\b(True|False|None)\b', re.DOTALL)
+_PYTHON_TO_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_UNESCAPED_SINGLE_QUOTE_RE = re.compile(r"(?<!\\)'")
+_OUTERMOST_JSON_RE = re.compile(r'(\{.*\}|\[.*\])', re.DOTALL)
+# Characters a JSON value can start with (after JSON whitespace), including the NaN/Infinity
+# literals json.loads accepts; text not matching this can never be parsed directly
+_JSON_VALUE_START_RE = re.compile(r'[ \t\n\r]*[{\["\-0-9tfnNI]')
+# Structural characters visited by find_json_spans, and the rest of a JSON string after its
+# opening quote (up to and including the closing quote, honoring backslash escapes)
+_JSON_STRUCTURAL_RE = re.compile(r'[{}\[\]"]')
+_JSON_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+def json_loads(text: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is available.
+    
+    orjson rejects a few documents the stdlib accepts (NaN/Infinity, integers wider than
+    64 bits), so anything it cannot parse is retried with json.loads. Invalid JSON raises
+    json.JSONDecodeError either way.
+    
+    Args:
+        text: The JSON document as str or bytes
+        
+    Returns:
+        The parsed JSON value
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+def json_dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a compact JSON string, using orjson when it is available.
+    
+    Meant for machine-consumed JSON (cache keys, re-parsed outputs): the output is compact,
+    unlike json.dumps defaults, so do not use it for text sent to a model. Both backends
+    produce the same text for ordinary data. Unsupported types are converted with str().
+    
+    Args:
+        obj: The object to serialize
+        sort_keys: Whether to sort dictionary keys (for stable hashing)
+        
+    Returns:
+        The JSON document as a string
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    return json.dumps(obj, sort_keys=sort_keys, default=str, separators=(",", ":"), ensure_ascii=False)
+
+class JsonCompletionTracker:
+    """
+    Incrementally tracks streamed text to detect when the first top-level JSON object
+    is complete, so generation can be stopped without re-parsing the buffer.
+    Text before the opening brace is ignored, as are brackets inside JSON strings.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.length = 0 # Characters consumed so far
+        self.end = None # Index just past the closing bracket, once complete
+    
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume the next chunk of text.
+        
+        Returns:
+            True once the first top-level JSON object has been closed
+        """
+        if self.end is not None:
+            return True
+        for offset, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"' and self.started:
+                self.in_string = True
+            elif char == "{" or (char == "[" and self.started):
+                self.depth += 1
+                self.started = True
+            elif char in "}]" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self.length + offset + 1
+                    break
+        self.length += len(chunk)
+        return self.end is not None
+
+def find_json_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) spans of balanced JSON objects/arrays in text, ordered by start.
+    
+    The text is scanned once, jumping between structural characters. A stack records the
+    position of each open bracket, and every bracket that gets closed becomes a span, so
+    an outer structure is yielded before the structures nested in it and a truncated outer
+    object still yields its complete inner ones. Strings are skipped as a whole, so brackets
+    inside them are ignored; quotes outside any bracket (in surrounding prose) are not
+    treated as strings. Callers try spans in order until one parses.
+    
+    Args:
+        text: The text to scan
+        
+    Yields:
+        Tuples of (start, end) indices such that text[start:end] is a balanced span
+    """
+    open_positions: List[int] = []
+    spans: List[Tuple[int, int]] = []
+    position = 0
+    while True:
+        match = _JSON_STRUCTURAL_RE.search(text, position)
+        if match is None:
+            break
+        index = match.start()
+        char = text[index]
+        position = index + 1
+        if char == '"':
+            if not open_positions:
+                continue
+            string_tail = _JSON_STRING_TAIL_RE.match(text, position)
+            if string_tail is None:
+                break # Unterminated string runs to the end of the text
+            position = string_tail.end()
+        elif char in "{[":
+            open_positions.append(index)
+        elif open_positions:
+            spans.append((open_positions.pop(), index + 1))
+    spans.sort()
+    yield from spans
+
+
+def extract_json_from_text(text: str) -> Tuple[Optional[Any], str]:
     """
     Robustly extract and parse JSON from text that may contain markdown, code blocks, or other formatting.
     
+    Results are memoized per text, since identical outputs are common (mock models,
+    low-temperature calls, retries); each caller receives its own copy of the parsed JSON.
+    
     Args:
         text: The text that potentially contains JSON
         
     Returns:
         Tuple of (parsed_json, extraction_method) where:
-        - parsed_json is the extracted and parsed JSON object or None if extraction failed
+        - parsed_json is the extracted and parsed JSON value (usually an object, but arrays and
+          scalars are returned as parsed) or None if extraction failed
         - extraction_method is a string describing how the JSON was extracted (for debugging)
     """
-    if not text or not isinstance(text, str) or text.strip() == "":
+    if not text or not isinstance(text, str) or text.isspace():
         logger.warning("Received empty or non-string input for JSON extraction")
         return None, "empty_input"
     
-    # First try direct parsing (most common case)
-    try:
-        parsed_json = json.loads(text)
-        logger.debug("Direct JSON parsing successful")
-        return parsed_json, "direct_parse"
-    except json.JSONDecodeError:
-        logger.debug("Direct JSON parsing failed, attempting extraction...")
-    
-    # Try various extraction patterns
-    extraction_patterns = [
-        # Code blocks with or without language specifier
-        (r'```(?:json)?\s*([\s\S]*?)```', "markdown_code_block"),
-        (r'```\s*([\s\S]*?)```', "markdown_code_block"),
-        
-        # Single backtick code (inline code)
-        (r'`([\s\S]*?)`', "inline_code"),
-        
-        # Just a JSON object in the text
-        (r'(\{[\s\S]*?\})', "json_object"),
-        
-        # Key-value pairs (output of some models)
-        (r'(?:[\r\n]|^)((?:(?:"?[a-zA-Z_][a-zA-Z0-9_]*"?\s*:\s*(?:"[^"]*"|\'[^\']*\'|true|false|null|-?\d+(?:\.\d+)?|undefined)[\s,]*)+))', "key_value_pairs")
-    ]
+    parsed_json, method = _extract_json_cached(text)
+    if parsed_json is None:
+        logger.warning(f"Failed to extract JSON from text. First 100 chars: {text[:100]}...")
+        return None, method
+    # Callers (e.g. validate_and_fix_json_structure) mutate the result, so never hand out the cached object
+    return copy.deepcopy(parsed_json), method
+
+
+@functools.lru_cache(maxsize=EXTRACTION_CACHE_SIZE)
+def _extract_json_cached(text: str) -> Tuple[Optional[Any], str]:
+    """Uncached extraction logic behind extract_json_from_text (expects non-empty text)."""
+    # First try direct parsing (most common case), skipping the decoders entirely for
+    # prose-first output that cannot be a JSON document
+    if _JSON_VALUE_START_RE.match(text):
+        try:
+            parsed_json = json_loads(text)
+            logger.debug("Direct JSON parsing successful")
+            return parsed_json, "direct_parse"
+        except json.JSONDecodeError:
+            logger.debug("Direct JSON parsing failed, attempting extraction...")
     
     # Try each extraction pattern
-    for pattern, method in extraction_patterns:
+    for pattern, method, required_substring in _EXTRACTION_PATTERNS:
+        if required_substring not in text:
+            continue
         try:
-            matches = re.findall(pattern, text, re.DOTALL)
+            matches = pattern.findall(text)
             
             # Try each match (if multiple)
             for match in matches:
@@ -78,22 +259,22 @@ def extract_json_from_text(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
                 
                 try:
                     # Try to parse the extracted text
-                    parsed_json = json.loads(extracted_text)
+                    parsed_json = json_loads(extracted_text)
                     logger.debug(f"Extracted JSON using method: {method}")
                     return parsed_json, method
                 except json.JSONDecodeError:
                     # This match didn't work, try to clean it up
                     try:
                         # Replace single quotes with double quotes around keys and string values
-                        fixed_text = re.sub(r'\'([^\']*?)\'', r'"\1"', extracted_text)
+                        fixed_text = _SINGLE_QUOTED_RE.sub(r'"\1"', extracted_text)
                         # Add quotes to unquoted keys
-                        fixed_text = re.sub(r'([{,])\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', fixed_text)
+                        fixed_text = _UNQUOTED_KEY_RE.sub(r'\1"\2":', fixed_text)
                         # Fix True/False to true/false
                         fixed_text = fixed_text.replace("True", "true").replace("False", "false")
                         # Remove trailing commas
-                        fixed_text = re.sub(r',\s*([}\]])', r'\1', fixed_text)
+                        fixed_text = _TRAILING_COMMA_RE.sub('', fixed_text)
                         
-                        parsed_json = json.loads(fixed_text)
+                        parsed_json = json_loads(fixed_text)
                         logger.debug(f"Extracted and fixed JSON using method: {method}_fixed")
                         return parsed_json, f"{method}_fixed"
                     except json.JSONDecodeError:
@@ -104,11 +285,60 @@ def extract_json_from_text(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
             logger.debug(f"Pattern matching error with method {method}: {e}")
             continue
     
+    # Last resort before any LLM-based repair: fix common edge-model formatting mistakes
+    repaired_json = heuristic_repair_json(text)
+    if repaired_json is not None:
+        logger.debug("Extracted JSON using method: heuristic_repair")
+        return repaired_json, "heuristic_repair"
+    
     # If we got here, all extraction methods failed
-    logger.warning(f"Failed to extract JSON from text. First 100 chars: {text[:100]}...")
     return None, "extraction_failed"
 
 
+# Cumulative clean-up steps for heuristic_repair_json, applied in order
+_HEURISTIC_REPAIR_STEPS: List[Callable[[str], str]] = [
+    # Markdown code fences around the JSON
+    lambda text: _CODE_FENCE_RE.sub('', text),
+    # Python literals instead of JSON literals
+    lambda text: _PYTHON_LITERAL_RE.sub(
+        lambda match: _PYTHON_TO_JSON_LITERALS[match.group(1)] if match.group(1) else match.group(0), text),
+    # Single-quoted keys and strings (unescaped quotes only)
+    lambda text: _UNESCAPED_SINGLE_QUOTE_RE.sub('"', text),
+    # Trailing commas before a closing brace or bracket
+    lambda text: _TRAILING_COMMA_RE.sub('', text),
+]
+
+
+def heuristic_repair_json(text: str) -> Optional[Any]:
+    """
+    Repair common JSON mistakes made by small models without another LLM call.
+    
+    Takes the outermost object or array in the text (dropping any preamble), then applies
+    the clean-up steps cumulatively, attempting to parse after each one.
+    
+    Args:
+        text: The text containing malformed JSON
+        
+    Returns:
+        The parsed JSON, or None if the text could not be repaired
+    """
+    if not text or not isinstance(text, str):
+        return None
+    
+    outermost = _OUTERMOST_JSON_RE.search(text)
+    if not outermost:
+        return None
+    
+    candidate = outermost.group(1)
+    for repair_step in _HEURISTIC_REPAIR_STEPS:
+        candidate = repair_step(candidate)
+        try:
+            return json_loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
 def validate_and_fix_json_structure(parsed_json: Dict[str, Any], 
                                    required_keys: List[str],
                                    default_values: Dict[str, Any]) -> Dict[str, Any]:
@@ -6,8 +6,11 @@ focusing on latency and token usage rather than detailed hardware monitoring.
 """
 
 import logging
+import math
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Sequence
 
 class MetricsCollector:
     """
@@ -18,15 +21,37 @@ class MetricsCollector:
     - Timing of operations (latency_ms)
     - Token usage tracking (input_tokens, output_tokens, total_tokens)
     - Basic performance statistics (tokens_per_second)
+    
+    Timer state is kept per thread, so a single instance can be shared by
+    model calls running concurrently on different threads.
     """
     
     def __init__(self):
         """Initialize the MetricsCollector"""
         self.logger = logging.getLogger("edgeprompt.runner.metrics")
-        self.start_time: Optional[float] = None
-        self.metrics_data: Dict[str, Any] = {}
+        self._local = threading.local()
         self.logger.info("MetricsCollector initialized")
     
+    @property
+    def start_time(self) -> Optional[float]:
+        """Start time of the current thread's timer, or None if not running."""
+        return getattr(self._local, "start_time", None)
+    
+    @start_time.setter
+    def start_time(self, value: Optional[float]) -> None:
+        self._local.start_time = value
+    
+    @property
+    def metrics_data(self) -> Dict[str, Any]:
+        """Metrics recorded by the current thread's last timed operation."""
+        if not hasattr(self._local, "metrics_data"):
+            self._local.metrics_data = {}
+        return self._local.metrics_data
+    
+    @metrics_data.setter
+    def metrics_data(self, value: Dict[str, Any]) -> None:
+        self._local.metrics_data = value
+    
     def start_timer(self) -> None:
         """
         Start the latency timer.
@@ -82,6 +107,19 @@ class MetricsCollector:
 
         self.logger.debug(f"Recorded {in_tokens} input tokens, {out_tokens} output tokens")
     
+    def record_cached_tokens(self, cached_input_tokens: Optional[int]) -> None:
+        """
+        Record how many input tokens the provider served from its prompt cache.
+        Only recorded for providers that report it, so the key is absent otherwise.
+        
+        Args:
+            cached_input_tokens: Number of cached input tokens (can be None).
+        """
+        if cached_input_tokens is None:
+            return
+        self.metrics_data['cached_input_tokens'] = cached_input_tokens
+        self.logger.debug(f"Recorded {cached_input_tokens} cached input tokens")
+    
     def get_results(self) -> Dict[str, Any]:
         """
         Get the collected metrics for the last timed operation.
@@ -97,6 +135,8 @@ class MetricsCollector:
             'total_tokens': self.metrics_data.get('total_tokens'),
             'tokens_per_second': self.metrics_data.get('tokens_per_second')
         }
+        if 'cached_input_tokens' in self.metrics_data:
+            final_metrics['cached_input_tokens'] = self.metrics_data['cached_input_tokens']
         return final_metrics
     
     def reset(self) -> None:
@@ -105,45 +145,162 @@ class MetricsCollector:
         self.metrics_data = {}
         self.logger.debug("Metrics collector reset")
     
-    def merge_metrics(self, metrics_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def new_accumulator(self) -> "MetricsAccumulator":
+        """
+        Create a running accumulator for summing metrics across multiple steps.
+        
+        Returns:
+            An empty MetricsAccumulator
+        """
+        return MetricsAccumulator(self.logger)
+    
+    def merge_metrics(self, metrics_list: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
         """
         Merge multiple metrics dictionaries into a single summary.
         Useful for aggregating metrics across multiple steps (e.g., validation stages).
         
         Args:
-            metrics_list: List of metrics dictionaries to merge
+            metrics_list: Iterable of metrics dictionaries to merge (consumed once; empty or
+                None entries are skipped)
             
         Returns:
             Dict containing summed metrics (latency, tokens) and recalculated avg tokens/sec.
         """
-        if not metrics_list:
-            return {}
-            
-        merged = {
-            'latency_ms': 0,
-            'input_tokens': 0,
-            'output_tokens': 0,
-            'total_tokens': 0,
-            'tokens_per_second': 0.0
-        }
-
-        valid_metrics_count = 0
+        accumulator = self.new_accumulator()
         for metrics in metrics_list:
-            if metrics:
-                merged['latency_ms'] += metrics.get('latency_ms', 0) or 0
-                merged['input_tokens'] += metrics.get('input_tokens', 0) or 0
-                merged['output_tokens'] += metrics.get('output_tokens', 0) or 0
-                merged['total_tokens'] += metrics.get('total_tokens', 0) or 0
-                valid_metrics_count += 1
+            accumulator.add(metrics)
+        return accumulator.finalize()
+
+
+class MetricsAccumulator:
+    """
+    Sums metrics dictionaries in a single pass as each step completes.
+    
+    Produces the same summary as MetricsCollector.merge_metrics without
+    building an intermediate list of per-step metrics.
+    """
+    
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Initialize an empty accumulator.
+        
+        Args:
+            logger: Logger used for warnings (defaults to the metrics logger)
+        """
+        self.logger = logger or logging.getLogger("edgeprompt.runner.metrics")
+        self.latency_ms = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_tokens = 0
+        self.cached_input_tokens: Optional[int] = None
+        self.merged_steps = 0
+    
+    def add(self, metrics: Optional[Dict[str, Any]]) -> None:
+        """
+        Add one step's metrics to the running totals. Empty or None metrics are ignored.
+        
+        Args:
+            metrics: Metrics dictionary from a single step (can be None)
+        """
+        if not metrics:
+            return
+        self.latency_ms += metrics.get('latency_ms', 0) or 0
+        self.input_tokens += metrics.get('input_tokens', 0) or 0
+        self.output_tokens += metrics.get('output_tokens', 0) or 0
+        self.total_tokens += metrics.get('total_tokens', 0) or 0
+        if metrics.get('cached_input_tokens') is not None:
+            self.cached_input_tokens = (self.cached_input_tokens or 0) + metrics['cached_input_tokens']
+        self.merged_steps += 1
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Build the merged metrics summary.
+        
+        Returns:
+            Dict containing summed metrics (latency, tokens) and recalculated avg tokens/sec,
+            or an empty dict if no metrics were added.
+        """
+        if not self.merged_steps:
+            return {}
 
-        if merged['latency_ms'] > 0 and merged['output_tokens'] > 0:
+        tokens_per_second = 0.0
+        if self.latency_ms > 0 and self.output_tokens > 0:
             try:
-                merged['tokens_per_second'] = round(
-                    merged['output_tokens'] / (merged['latency_ms'] / 1000.0), 2
-                )
+                tokens_per_second = round(self.output_tokens / (self.latency_ms / 1000.0), 2)
             except ZeroDivisionError:
-                 self.logger.warning("Division by zero calculating merged tokens_per_second.")
-                 merged['tokens_per_second'] = 0.0
+                self.logger.warning("Division by zero calculating merged tokens_per_second.")
+                tokens_per_second = 0.0
+
+        merged = {
+            'latency_ms': self.latency_ms,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+            'total_tokens': self.total_tokens,
+            'tokens_per_second': tokens_per_second,
+            'merged_steps': self.merged_steps
+        }
+        if self.cached_input_tokens is not None:
+            merged['cached_input_tokens'] = self.cached_input_tokens
+        return merged
+
 
-        merged['merged_steps'] = valid_metrics_count
-        return merged 
\ No newline at end of file
+class RunStatusTable:
+    """
+    Column store of per-run status records for the end-of-suite summary.
+    
+    Instead of keeping one dict per run, status buckets are counted as records are
+    added and scores/latencies are appended to one compact float array per run type
+    (NaN where a run reported no value), ready for column-wise statistics.
+    """
+    
+    STATUS_BUCKETS = ("completed", "failed", "pending")
+    
+    def __init__(self, run_keys: Sequence[str]):
+        """
+        Initialize an empty table.
+        
+        Args:
+            run_keys: Names of the runs recorded per combination (e.g. run_1..run_4)
+        """
+        self.run_keys = tuple(run_keys)
+        self.run_ids: List[Optional[str]] = []
+        self.error_count = 0 # Top-level errors plus failed runs
+        self.status_counts = {run_key: dict.fromkeys(self.STATUS_BUCKETS, 0) for run_key in self.run_keys}
+        self.final_scores = {run_key: array('d') for run_key in self.run_keys}
+        self.latencies_ms = {run_key: array('d') for run_key in self.run_keys}
+    
+    def __len__(self) -> int:
+        return len(self.run_ids)
+    
+    def add(self, status_record: Dict[str, Any]) -> None:
+        """
+        Add one run's status record.
+        
+        Args:
+            status_record: Dict with "id", "error" and, per run key, a dict with
+                "status", "error", "final_score" and "latency_ms"
+        """
+        self.run_ids.append(status_record.get("id"))
+        if status_record.get("error"):
+            self.error_count += 1
+        
+        for run_key in self.run_keys:
+            run_data = status_record.get(run_key, {})
+            status = run_data.get("status", "pending")
+            if status == "completed":
+                bucket = "completed"
+            elif status == "failed" or run_data.get("error"):
+                bucket = "failed"
+                self.error_count += 1
+            else:
+                bucket = "pending"
+            self.status_counts[run_key][bucket] += 1
+            self.final_scores[run_key].append(self._as_float(run_data.get("final_score")))
+            self.latencies_ms[run_key].append(self._as_float(run_data.get("latency_ms")))
+    
+    @staticmethod
+    def _as_float(value: Any) -> float:
+        """Converts a numeric result field to float, mapping missing/non-numeric values to NaN."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return math.nan
+        return float(value)
@@ -8,13 +8,17 @@ This module separates model access concerns from experiment logic to:
 - Allow for mock models to speed up development and testing cycles
 """
 
+import concurrent.futures
+import functools
 import json
 import logging
 import os
 import random
+import threading
 import time
+import zlib
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Third-party imports (assuming installed, add try-except blocks for graceful failure)
 try:
@@ -27,12 +31,75 @@ except ImportError:
     openai = None
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     requests = None
+    HTTPAdapter = None
 
 # Local application imports
 from .config_loader import ConfigLoader
 from .metrics_collector import MetricsCollector
+from .json_utils import json_dumps, json_loads, JsonCompletionTracker
+
+# Number of distinct (model, system prompt, prompt) mock completions memoized by _mock_completion
+MOCK_CACHE_SIZE = 4096
+
+@functools.lru_cache(maxsize=MOCK_CACHE_SIZE)
+def _mock_completion(model_id: str, model_type: str, prompt: str, system_prompt: Optional[str],
+                     expect_json: bool) -> Tuple[str, str, int, int, float]:
+    """
+    Builds a mock completion. Pure in its arguments, so repeated prompts are served from the cache.
+    
+    The system prompt counts as input like the prompt itself, as it does in real providers'
+    token usage, so runs that move fixed instructions into it stay comparable.
+    
+    Returns:
+        Tuple of (output_key, generated_text, prompt_tokens, completion_tokens, simulated delay in seconds)
+    """
+    # Simulated processing delay based on prompt length and model type, reported as the
+    # call latency (MockModel only sleeps for it when simulate_delay is set)
+    input_text = f"{system_prompt}\n{prompt}" if system_prompt else prompt
+    delay = min(0.5 if model_type == "edge_llm" else 1.5, len(input_text) * 0.0002)
+    
+    # Mock values are drawn from a generator seeded by the model and input, so repeated
+    # calls are reproducible and the global random state is left untouched
+    rng = random.Random(zlib.crc32(f"{model_id}\0{input_text}".encode("utf-8")))
+    
+    # Generate different mock responses based on model type and structure
+    if model_type == "cloud_llm":
+        generated_text = f"MOCK CloudLLM RESPONSE from {model_id}: This simulates a persona response."
+        if expect_json:
+            # Mimic CloudLLM_Interaction output structure (nested under llm_output)
+            mock_obj = {
+                "role": "teacher" if "teacher" in input_text.lower() else "student",
+                "content": f"Mock {model_id} response with simulated JSON structure",
+                "evaluation": {
+                    "score": rng.randint(6, 9),
+                    "feedback": "This is mock feedback from the CloudLLM model.",
+                    "passed": True
+                }
+            }
+            generated_text = json.dumps(mock_obj)
+        output_key = "llm_output" # Key defined in CloudLLM_Interaction spec
+    else:  # edge_llm
+        generated_text = f"MOCK EdgeLLM RESPONSE from {model_id}: This simulates an edge model response."
+        if expect_json:
+            # Mimic EdgeLLMExecution output structure (nested under generated_text)
+            # Often used for validation stages
+            mock_obj = {
+                "passed": rng.choice([True, True, False]),  # Bias toward passing
+                "score": rng.uniform(0.5, 1.0),
+                "feedback": "This is mock feedback from the EdgeLLM validation model.",
+                "word_count": rng.randint(40, 120) # Example extra data
+            }
+            generated_text = json.dumps(mock_obj)
+        output_key = "generated_text" # Key defined in EdgeLLMExecution spec
+    
+    # Estimate token counts based on input/output length
+    # (Very rough estimate, real APIs provide this)
+    prompt_tokens = len(input_text.split())
+    completion_tokens = len(generated_text.split())
+    return output_key, generated_text, prompt_tokens, completion_tokens, delay
 
 class MockModel:
     """
@@ -45,16 +112,19 @@ class MockModel:
     - Eliminates network latency and API costs during development
     """
     
-    def __init__(self, model_id: str, model_type: str = "edge_llm"):
+    def __init__(self, model_id: str, model_type: str = "edge_llm", simulate_delay: bool = False):
         """
         Retains model identity to maintain traceability in mock scenarios.
         
         Args:
             model_id: Identifier for the model
             model_type: Type of model ('cloud_llm' or 'edge_llm')
+            simulate_delay: If True, actually sleep for the simulated latency (e.g. to exercise
+                scheduling/concurrency); otherwise the latency is only reported in the metrics
         """
         self.model_id = model_id
         self.model_type = model_type
+        self.simulate_delay = simulate_delay
         self.logger = logging.getLogger(f"edgeprompt.runner.mock_model.{model_id}")
         
     def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
@@ -68,51 +138,19 @@ class MockModel:
         Returns:
             Dict containing generation results mimicking algorithm structure.
         """
-        self.logger.debug(f"Generating mock response for prompt (first 50 chars): {prompt[:50]}... Args: {kwargs}")
-        
-        # Simulate processing delay based on prompt length and model type
-        delay = min(0.5 if self.model_type == "edge_llm" else 1.5, len(prompt) * 0.0002)
-        time.sleep(delay)
+        self.logger.debug("Generating mock response for prompt (first 50 chars): %s... Args: %s", prompt[:50], kwargs)
         
-        # Generate different mock responses based on model type and structure
         # Determine if JSON output is expected based on common keys
-        expect_json = kwargs.get("json_output", False) or \
-                      kwargs.get("response_format", {}).get("type") == "json_object" or \
-                      "json" in prompt.lower() # Simple heuristic
+        system_prompt = kwargs.get("system_prompt")
+        expect_json = bool(kwargs.get("json_output", False) or \
+                           kwargs.get("response_format", {}).get("type") == "json_object" or \
+                           "json" in prompt.lower() or \
+                           (system_prompt and "json" in system_prompt.lower())) # Simple heuristic
         
-        if self.model_type == "cloud_llm":
-            generated_text = f"MOCK CloudLLM RESPONSE from {self.model_id}: This simulates a persona response."
-            if expect_json:
-                # Mimic CloudLLM_Interaction output structure (nested under llm_output)
-                mock_obj = {
-                    "role": "teacher" if "teacher" in prompt.lower() else "student",
-                    "content": f"Mock {self.model_id} response with simulated JSON structure",
-                    "evaluation": {
-                        "score": random.randint(6, 9),
-                        "feedback": "This is mock feedback from the CloudLLM model.",
-                        "passed": True
-                    }
-                }
-                generated_text = json.dumps(mock_obj)
-            output_key = "llm_output" # Key defined in CloudLLM_Interaction spec
-        else:  # edge_llm
-            generated_text = f"MOCK EdgeLLM RESPONSE from {self.model_id}: This simulates an edge model response."
-            if expect_json:
-                 # Mimic EdgeLLMExecution output structure (nested under generated_text)
-                 # Often used for validation stages
-                mock_obj = {
-                    "passed": random.choice([True, True, False]),  # Bias toward passing
-                    "score": random.uniform(0.5, 1.0),
-                    "feedback": "This is mock feedback from the EdgeLLM validation model.",
-                    "word_count": random.randint(40, 120) # Example extra data
-                }
-                generated_text = json.dumps(mock_obj)
-            output_key = "generated_text" # Key defined in EdgeLLMExecution spec
-        
-        # Estimate token counts based on input/output length
-        # (Very rough estimate, real APIs provide this)
-        prompt_tokens = len(prompt.split())
-        completion_tokens = len(generated_text.split())
+        output_key, generated_text, prompt_tokens, completion_tokens, delay = _mock_completion(
+            self.model_id, self.model_type, prompt, system_prompt, expect_json)
+        if self.simulate_delay:
+            time.sleep(delay)
         
         # Mimic the structure returned by _execute_model_call helper
         result = {
@@ -126,7 +164,7 @@ class MockModel:
                  "tokens_per_second": completion_tokens / delay if delay > 0 else 0
             }
         }
-        self.logger.debug(f"Mock generation complete. Result keys: {result.keys()}")
+        self.logger.debug("Mock generation complete. Result keys: %s", result.keys())
         return result
         
 class ModelManager:
@@ -137,10 +175,32 @@ class ModelManager:
     Aligns with `CloudLLM_Interaction` and `EdgeLLMExecution` algorithms.
     """
     
+    # Idle keep-alive connections kept per host by the LM Studio HTTP session
+    HTTP_POOL_SIZE = 16
+    
+    # (connect, read) timeout in seconds for LM Studio requests: fail fast when the server is
+    # unreachable, but never cut off a long local generation
+    LM_STUDIO_TIMEOUT = (10, None)
+    
+    # Default number of requests execute_edge_llm_batch keeps in flight at once
+    EDGE_BATCH_CONCURRENCY = 4
+    
+    # Default number of requests execute_cloud_llm_batch keeps in flight at once
+    CLOUD_BATCH_CONCURRENCY = 8
+    
+    # Retries the OpenAI/Anthropic SDKs make, with exponential backoff and jitter, for transient
+    # failures only (connection errors, timeouts, 408/409/429 and 5xx responses); any other error
+    # is raised at once and reported in the call's error result
+    CLOUD_API_MAX_RETRIES = 4
+    
     def __init__(self, config_loader: ConfigLoader, metrics_collector: MetricsCollector,
                  lm_studio_url: Optional[str] = None,
                  openai_api_key: Optional[str] = None,
-                 anthropic_api_key: Optional[str] = None):
+                 anthropic_api_key: Optional[str] = None,
+                 stream_json_outputs: bool = False,
+                 edge_prompt_cache: bool = False,
+                 edge_batch_concurrency: Optional[int] = None,
+                 mock_sleep: bool = False):
         """
         Initialize ModelManager.
 
@@ -150,6 +210,14 @@ class ModelManager:
             lm_studio_url: URL for LM Studio API (for some EdgeLLM).
             openai_api_key: OpenAI API key (for CloudLLM).
             anthropic_api_key: Anthropic API key (for CloudLLM).
+            stream_json_outputs: If True, JSON-mode LM Studio and OpenAI calls are streamed and stopped
+                as soon as the JSON object is complete, instead of waiting for the full completion.
+            edge_prompt_cache: If True, LM Studio requests ask the server to keep and reuse the KV
+                cache of the matching prompt prefix ("cache_prompt", honored by llama.cpp-based servers).
+            edge_batch_concurrency: Maximum number of requests execute_edge_llm_batch keeps in flight
+                (defaults to EDGE_BATCH_CONCURRENCY). Set it to the server's number of parallel slots.
+            mock_sleep: If True, mock models sleep for their simulated latency instead of only
+                reporting it.
         """
         self.logger = logging.getLogger("edgeprompt.runner.model_manager")
         self.config_loader = config_loader
@@ -159,6 +227,10 @@ class ModelManager:
         self.lm_studio_url = lm_studio_url or os.environ.get("LM_STUDIO_URL", "http://localhost:1234/v1") # Ensure /v1 for completions endpoint
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
         self.anthropic_api_key = anthropic_api_key or os.environ.get("ANTHROPIC_API_KEY")
+        self.stream_json_outputs = stream_json_outputs
+        self.edge_prompt_cache = edge_prompt_cache
+        self.edge_batch_concurrency = max(1, edge_batch_concurrency or self.EDGE_BATCH_CONCURRENCY)
+        self.mock_sleep = mock_sleep
         
         # Cache loaded model instances/clients
         self.loaded_models: Dict[str, Dict[str, Any]] = {} # Cache stores {model_key: model_data_with_instance/client}
@@ -166,6 +238,10 @@ class ModelManager:
         # Lazy initialization for API clients
         self._openai_client = None
         self._anthropic_client = None
+        # Persistent HTTP session so LM Studio calls reuse keep-alive connections
+        self._http_session = None
+        # Guards lazy creation of the shared clients/session, so concurrent runs never build duplicates
+        self._client_lock = threading.Lock()
         
         self.logger.info("ModelManager initialized.")
         if not self.openai_api_key: self.logger.warning("OpenAI API key not provided.")
@@ -180,7 +256,10 @@ class ModelManager:
         if not self._openai_client:
             if not self.openai_api_key:
                 raise ValueError("OpenAI API key is required but not provided.")
-            self._openai_client = openai.OpenAI(api_key=self.openai_api_key)
+            with self._client_lock:
+                if not self._openai_client:
+                    self._openai_client = openai.OpenAI(api_key=self.openai_api_key,
+                                                        max_retries=self.CLOUD_API_MAX_RETRIES)
         return self._openai_client
     
     def _get_anthropic_client(self):
@@ -191,9 +270,35 @@ class ModelManager:
         if not self._anthropic_client:
             if not self.anthropic_api_key:
                  raise ValueError("Anthropic API key is required but not provided.")
-            self._anthropic_client = anthropic.Anthropic(api_key=self.anthropic_api_key)
+            with self._client_lock:
+                if not self._anthropic_client:
+                    self._anthropic_client = anthropic.Anthropic(api_key=self.anthropic_api_key,
+                                                                 max_retries=self.CLOUD_API_MAX_RETRIES)
         return self._anthropic_client
     
+    def _get_http_session(self):
+        """Lazily initializes and returns the pooled HTTP session used for LM Studio calls."""
+        if not requests:
+            self.logger.error("`requests` library not installed. Cannot create HTTP session.")
+            raise ImportError("requests library is required.")
+        with self._client_lock:
+            if not self._http_session:
+                session = requests.Session()
+                # Keep enough idle keep-alive connections for concurrent (batched/parallel) calls
+                adapter = HTTPAdapter(pool_connections=1,
+                                      pool_maxsize=max(self.HTTP_POOL_SIZE, self.edge_batch_concurrency))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._http_session = session
+            return self._http_session
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections held by the ModelManager."""
+        with self._client_lock:
+            if self._http_session:
+                self._http_session.close()
+                self._http_session = None
+    
     def _initialize_model(self, model_id: str, model_type: str, mock_mode: bool) -> Dict[str, Any]:
         """
         Helper to initialize or retrieve a model (CloudLLM or EdgeLLM).
@@ -221,7 +326,7 @@ class ModelManager:
         # Create mock model if requested
         if mock_mode:
             self.logger.info(f"Initializing mock {model_type.upper()}: {model_id}")
-            mock_instance = MockModel(model_id, model_type=model_type)
+            mock_instance = MockModel(model_id, model_type=model_type, simulate_delay=self.mock_sleep)
             model_config["mock"] = True
             model_config["instance"] = mock_instance
             self.loaded_models[model_key] = model_config
@@ -275,7 +380,7 @@ class ModelManager:
         Helper function to wrap model execution, handle timing, metrics, and errors.
         """
         model_id = model_data.get("model_id", "unknown")
-        self.logger.debug(f"Executing {model_id} with prompt (first 50 chars): {prompt[:50]}...")
+        self.logger.debug("Executing %s with prompt (first 50 chars): %s...", model_id, prompt[:50])
 
         try:
             # Start metrics collection before the call
@@ -293,7 +398,7 @@ class ModelManager:
                 "output_tokens": output_tokens,
                 "metrics": performance_metrics
             }
-            self.logger.debug(f"Execution successful for {model_id}. Output size: {len(output_text)} chars.")
+            self.logger.debug("Execution successful for %s. Output size: %d chars.", model_id, len(output_text))
             return result
             
         except Exception as e:
@@ -318,7 +423,8 @@ class ModelManager:
         Args:
             model_data: Model configuration dictionary (from initialize_cloud_llm).
             prompt: The prompt string.
-            params: Dictionary of generation parameters (e.g., temperature, max_tokens, response_format).
+            params: Dictionary of generation parameters (e.g., temperature, max_tokens, response_format,
+                    system_prompt for a cacheable static prefix).
 
         Returns:
             Dictionary containing 'llm_output', token counts, and 'metrics'. Includes 'error' on failure.
@@ -335,6 +441,7 @@ class ModelManager:
         client = model_data.get("client")
         if not client:
              return {"error": f"CloudLLM client for {model_id} not initialized.", "llm_output": None, "metrics": {}}
+        system_prompt = params.get("system_prompt")
 
         def api_call() -> Tuple[str, int, int]:
             if provider == "openai":
@@ -342,32 +449,46 @@ class ModelManager:
                 response_format = params.get("response_format")
                 openai_params = {
                     "model": model_id,
-                    "messages": [{"role": "user", "content": prompt}],
+                    "messages": self._build_messages(prompt, system_prompt),
                     "temperature": params.get("temperature", 0.5),
                     "max_tokens": params.get("max_tokens", 512),
                 }
                 # Correctly handle JSON mode for OpenAI
                 if isinstance(response_format, dict) and response_format.get("type") == "json_object":
                      openai_params["response_format"] = {"type": "json_object"}
+                     if self.stream_json_outputs:
+                         # Stream instead, so reading stops as soon as the JSON object is complete
+                         return self._stream_openai_json(client, openai_params)
 
                 response = client.chat.completions.create(**openai_params)
                 output_text = response.choices[0].message.content
                 in_tokens = response.usage.prompt_tokens
                 out_tokens = response.usage.completion_tokens
+                prompt_details = getattr(response.usage, "prompt_tokens_details", None)
+                self.metrics_collector.record_cached_tokens(getattr(prompt_details, "cached_tokens", None))
                 return output_text, in_tokens, out_tokens
 
             elif provider == "anthropic":
                 if not anthropic: raise ImportError("Anthropic library not installed.")
                 # Anthropic uses 'max_tokens' directly, not 'max_tokens_to_sample' in latest versions
-                response = client.messages.create(
-                    model=model_id,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=params.get("temperature", 0.5),
-                    max_tokens=params.get("max_tokens", 512),
-                )
+                anthropic_params = {
+                    "model": model_id,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": params.get("temperature", 0.5),
+                    "max_tokens": params.get("max_tokens", 512),
+                }
+                if system_prompt:
+                    # Mark the shared prefix as cacheable so repeated runs only pay prefill once
+                    anthropic_params["system"] = [{
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"}
+                    }]
+                response = client.messages.create(**anthropic_params)
                 output_text = response.content[0].text
                 in_tokens = response.usage.input_tokens
                 out_tokens = response.usage.output_tokens
+                self.metrics_collector.record_cached_tokens(getattr(response.usage, "cache_read_input_tokens", None))
                 return output_text, in_tokens, out_tokens
             else:
                 raise ValueError(f"Unsupported CloudLLM provider for execution: {provider}")
@@ -383,7 +504,8 @@ class ModelManager:
         Args:
             model_data: Model configuration dictionary (from initialize_edge_llm).
             prompt: The prompt string.
-            params: Dictionary of generation parameters (e.g., temperature, max_tokens).
+            params: Dictionary of generation parameters (e.g., temperature, max_tokens, system_prompt,
+                    and optionally top_k, top_p and seed).
 
         Returns:
             Dictionary containing 'generated_text', token counts, and 'metrics'. Includes 'error' on failure.
@@ -413,18 +535,25 @@ class ModelManager:
                       base_url += '/v1' 
             # Construct the final endpoint URL
             api_url = f"{base_url}/chat/completions"
-            self.logger.debug(f"Constructed LM Studio API URL: {api_url}")
+            self.logger.debug("Constructed LM Studio API URL: %s", api_url)
             # --- End endpoint construction ---
 
             # Prepare payload (OpenAI compatible)
             payload = {
                 # Use model_id from config for LM Studio, assuming it matches loaded model ID
                 "model": model_id, 
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": self._build_messages(prompt, params.get("system_prompt")),
                 "temperature": params.get("temperature", 0.7),
                 "max_tokens": params.get("max_tokens", 256), # Typically smaller for edge
                 "stream": False # Expect single response
             }
+            # Optional sampling controls (e.g. greedy decoding), forwarded only when requested
+            for sampling_key in ("top_k", "top_p", "seed"):
+                if sampling_key in params:
+                    payload[sampling_key] = params[sampling_key]
+            if self.edge_prompt_cache:
+                # Reuse the server's KV cache for the prefix shared with the previous request
+                payload["cache_prompt"] = True
             # Handle JSON format requestsj
             json_format_requested = params.get("json_output", False) or (
                 isinstance(params.get("response_format"), dict) and 
@@ -433,16 +562,18 @@ class ModelManager:
             
             # Since LM Studio doesn't support response_format parameter,
             # we'll modify the prompt to emphasize JSON output when requested
-            if json_format_requested and not "json" in prompt.lower():
+            instructions_text = f"{params.get('system_prompt') or ''}\n{prompt}"
+            if json_format_requested and not "json" in instructions_text.lower():
                 # Add explicit JSON formatting instructions
                 prompt_addition = "\n\nIMPORTANT: Your response must be a valid JSON object only. Do not include any text outside the JSON object."
-                payload["messages"][0]["content"] = prompt + prompt_addition
+                payload["messages"][-1]["content"] = prompt + prompt_addition
                 self.logger.debug("Added JSON formatting instructions to prompt.")
 
             headers = {"Content-Type": "application/json"}
+            http_session = self._get_http_session()
 
             def api_call() -> Tuple[str, int, int]:
-                response = requests.post(api_url, headers=headers, json=payload)
+                response = http_session.post(api_url, headers=headers, json=payload, timeout=self.LM_STUDIO_TIMEOUT)
                 response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
                 data = response.json()
                 
@@ -454,6 +585,12 @@ class ModelManager:
                     # Extract token counts if available
                     input_tokens = data.get('usage', {}).get('prompt_tokens', 0)
                     output_tokens = data.get('usage', {}).get('completion_tokens', 0)
+                    prompt_details = data.get('usage', {}).get('prompt_tokens_details') or {}
+                    cached_tokens = prompt_details.get('cached_tokens')
+                    if cached_tokens is None:
+                        # llama.cpp servers report prompt-cache reuse in their timings block
+                        cached_tokens = (data.get('timings') or {}).get('cache_n')
+                    self.metrics_collector.record_cached_tokens(cached_tokens)
                     
                     return output_text, input_tokens, output_tokens
                 except KeyError as e:
@@ -462,6 +599,11 @@ class ModelManager:
                     raise # Re-raise the error after logging
                 # --- End added error handling ---
 
+            if json_format_requested and self.stream_json_outputs:
+                # Stream instead, so generation stops as soon as the JSON object is complete
+                payload["stream"] = True
+                api_call = lambda: self._stream_lm_studio_json(http_session, api_url, headers, payload)
+
             result = self._execute_model_call(
                 model_data=model_data,  # Pass the full model data dict
                 prompt=prompt, 
@@ -474,7 +616,7 @@ class ModelManager:
                 generated_text = result.get("generated_text", "")
                 try:
                     # Test if it's valid JSON
-                    json.loads(generated_text)
+                    json_loads(generated_text)
                     # It's valid, no need to repair
                 except json.JSONDecodeError:
                     # It's not valid JSON, attempt repair (limit to one attempt)
@@ -496,6 +638,157 @@ class ModelManager:
                 "metrics": {}
             }
 
+    def _stream_lm_studio_json(self, http_session, api_url: str, headers: Dict[str, str],
+                               payload: Dict[str, Any]) -> Tuple[str, int, int]:
+        """
+        Streams an LM Studio chat completion and stops reading once the JSON object closes.
+
+        Closing the response drops the connection, which makes LM Studio abort the rest of
+        the generation (e.g., trailing explanations after the JSON).
+
+        Returns:
+            Tuple of (output_text, input_tokens, output_tokens). Without a usage block in the
+            stream, output_tokens is the number of content chunks received.
+        """
+        tracker = JsonCompletionTracker()
+        chunks: List[str] = []
+        usage: Dict[str, Any] = {}
+        response = http_session.post(api_url, headers=headers, json=payload, stream=True,
+                                     timeout=self.LM_STUDIO_TIMEOUT)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json_loads(data)
+                usage = event.get("usage") or usage
+                choices = event.get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content") or ""
+                if not content:
+                    continue
+                chunks.append(content)
+                if tracker.feed(content):
+                    self.logger.debug("JSON object complete; stopping LM Studio stream early.")
+                    break
+        finally:
+            response.close()
+
+        output_text = "".join(chunks)
+        if tracker.end is not None:
+            output_text = output_text[:tracker.end]
+        return output_text, usage.get("prompt_tokens", 0), usage.get("completion_tokens", len(chunks))
+
+    def _stream_openai_json(self, client, openai_params: Dict[str, Any]) -> Tuple[str, int, int]:
+        """
+        Streams an OpenAI JSON-mode chat completion and stops reading once the JSON object closes.
+
+        Closing the stream drops the connection, which ends the generation (JSON mode can
+        otherwise pad the object with whitespace up to max_tokens).
+
+        Returns:
+            Tuple of (output_text, input_tokens, output_tokens). The usage chunk only arrives at
+            the end of the stream, so when it is cut short output_tokens is the number of content
+            chunks received and input_tokens is 0.
+        """
+        tracker = JsonCompletionTracker()
+        chunks: List[str] = []
+        usage = None
+        stream = client.chat.completions.create(**openai_params, stream=True,
+                                                stream_options={"include_usage": True})
+        try:
+            for event in stream:
+                usage = event.usage or usage
+                content = event.choices[0].delta.content if event.choices else None
+                if not content:
+                    continue
+                chunks.append(content)
+                if tracker.feed(content):
+                    self.logger.debug("JSON object complete; stopping OpenAI stream early.")
+                    break
+        finally:
+            stream.close()
+
+        output_text = "".join(chunks)
+        if tracker.end is not None:
+            output_text = output_text[:tracker.end]
+        if usage is None:
+            return output_text, 0, len(chunks)
+        prompt_details = getattr(usage, "prompt_tokens_details", None)
+        self.metrics_collector.record_cached_tokens(getattr(prompt_details, "cached_tokens", None))
+        return output_text, usage.prompt_tokens, usage.completion_tokens
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Builds the chat messages for OpenAI-compatible APIs.
+
+        A static system prompt is always sent first so consecutive calls share a
+        byte-identical prefix, letting provider/LM Studio prefix (KV) caches be reused.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages
+
+    def execute_edge_llm_batch(self, model_data: Dict[str, Any], prompts: List[str],
+                               params: Optional[Dict[str, Any]] = None,
+                               max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a batch of independent prompts against the same EdgeLLM.
+
+        LM Studio exposes no batch endpoint, so the prompts are sent as concurrent requests
+        over the pooled HTTP session; servers with parallel slots (LM Studio, llama.cpp)
+        then batch them together instead of serving them one at a time.
+
+        Args:
+            model_data: Model configuration dictionary (from initialize_edge_llm).
+            prompts: The prompt strings to execute.
+            params: Generation parameters shared by every prompt.
+            max_concurrency: Maximum number of requests in flight at once (defaults to the
+                edge_batch_concurrency the ModelManager was created with).
+
+        Returns:
+            One result dictionary per prompt (same format as execute_edge_llm), in input order.
+        """
+        if len(prompts) <= 1:
+            return [self.execute_edge_llm(model_data, prompt, params) for prompt in prompts]
+
+        workers = max(1, min(len(prompts), max_concurrency or self.edge_batch_concurrency))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="edge-llm-batch") as pool:
+            futures = [pool.submit(self.execute_edge_llm, model_data, prompt, params) for prompt in prompts]
+            return [future.result() for future in futures]
+
+    def execute_cloud_llm_batch(self, model_data: Dict[str, Any], prompts: List[str],
+                                params: Optional[Dict[str, Any]] = None,
+                                max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a batch of independent prompts against the same CloudLLM.
+
+        The prompts are sent as concurrent requests from a thread pool. All threads share the
+        ModelManager's single OpenAI/Anthropic client (and its connection pool), which the SDKs
+        support; metrics are tracked per thread by the MetricsCollector.
+
+        Args:
+            model_data: Model configuration dictionary (from initialize_cloud_llm).
+            prompts: The prompt strings to execute.
+            params: Generation parameters shared by every prompt.
+            max_concurrency: Maximum number of requests in flight at once (defaults to
+                CLOUD_BATCH_CONCURRENCY).
+
+        Returns:
+            One result dictionary per prompt (same format as execute_cloud_llm), in input order.
+        """
+        if len(prompts) <= 1:
+            return [self.execute_cloud_llm(model_data, prompt, params) for prompt in prompts]
+
+        workers = max(1, min(len(prompts), max_concurrency or self.CLOUD_BATCH_CONCURRENCY))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cloud-llm-batch") as pool:
+            futures = [pool.submit(self.execute_cloud_llm, model_data, prompt, params) for prompt in prompts]
+            return [future.result() for future in futures]
+
     def unload_model(self, model_id: str, model_type: str = "edge_llm"):
         """Removes a model from the cache (conceptual unload)."""
         model_key = f"{model_type}:{model_id}"
@@ -542,7 +835,7 @@ class ModelManager:
         if parsed_json is not None:
             self.logger.info(f"Already valid JSON or successfully extracted (method: {method})")
             # Convert back to string
-            return json.dumps(parsed_json)
+            return json_dumps(parsed_json)
         
         # If extraction failed, try repair
         required_keys = ["passed", "score", "feedback"]
@@ -563,7 +856,7 @@ class ModelManager:
         )
         
         # Return the result as JSON string
-        return json.dumps(repair_result)
+        return json_dumps(repair_result)
         
     # For backwards compatibility
     def repair_json_output(self, text: str, model_data: Dict[str, Any], max_attempts: int = 1) -> str:
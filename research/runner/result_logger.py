@@ -10,7 +10,35 @@ import logging
 import os
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+# Optional fast JSON encoder; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Local application imports
+from .json_utils import json_loads
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes, using orjson when it is available.
+    
+    Args:
+        obj: The object to serialize
+        indent: Whether to pretty-print with a 2-space indent
+        
+    Returns:
+        The encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
 
 class ResultLogger:
     """
@@ -32,6 +60,9 @@ class ResultLogger:
         self.logger = logging.getLogger("edgeprompt.runner.results")
         self.output_dir = output_dir
         self._ensure_output_dir()
+        # Append-only JSONL stream of every run result (opened lazily, kept open)
+        self._records_path = os.path.join(self.output_dir, "all_results.jsonl")
+        self._records_file = None
         self.logger.info(f"ResultLogger initialized with output dir: {output_dir}")
     
     def _ensure_output_dir(self) -> None:
@@ -69,18 +100,37 @@ class ResultLogger:
         file_path = os.path.join(self.output_dir, filename)
         
         # Write the result to the file
-        with open(file_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(_json_bytes(result, indent=True))
             
         self.logger.info(f"Result logged to: {file_path}")
         
         # Also append to a JSONL file for easier batch processing
-        jsonl_path = os.path.join(self.output_dir, "all_results.jsonl")
-        with open(jsonl_path, 'a') as f:
-            f.write(json.dumps(result) + "\n")
+        self.append_record(result)
             
         return file_path
     
+    def append_record(self, record: Dict[str, Any]) -> None:
+        """
+        Append a single record to the all_results.jsonl stream.
+        
+        The file handle is kept open between calls so results can be streamed
+        to disk as they are produced instead of being accumulated in memory.
+        
+        Args:
+            record: The result record to append
+        """
+        if self._records_file is None:
+            self._records_file = open(self._records_path, 'ab')
+        self._records_file.write(_json_bytes(record) + b"\n")
+        self._records_file.flush()
+    
+    def close(self) -> None:
+        """Close the all_results.jsonl stream (it is reopened on the next append)."""
+        if self._records_file is not None:
+            self._records_file.close()
+            self._records_file = None
+    
     def log_aggregate_results(self, results: List[Dict[str, Any]], name: str) -> str:
         """
         Log aggregate results from multiple tests.
@@ -105,8 +155,8 @@ class ResultLogger:
         file_path = os.path.join(self.output_dir, filename)
         
         # Write the results to the file
-        with open(file_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(_json_bytes(results, indent=True))
             
         self.logger.info(f"Aggregate results logged to: {file_path}")
         
@@ -116,52 +166,66 @@ class ResultLogger:
         """
         Get all logged results.
         
+        Loads every result into memory; use iter_results to process large suites.
+        
         Returns:
             List of all test results
         """
-        results = []
+        results = list(self.iter_results())
+        self.logger.info(f"Loaded {len(results)} results from {self.output_dir}")
+        return results
+    
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream logged results one at a time, without loading the whole suite into memory.
+        
+        Reads the all_results.jsonl stream if it exists, otherwise the individual result files.
         
+        Yields:
+            Each logged test result
+        """
         # Check if the JSONL file exists
-        jsonl_path = os.path.join(self.output_dir, "all_results.jsonl")
+        jsonl_path = self._records_path
         if os.path.exists(jsonl_path):
-            with open(jsonl_path, 'r') as f:
+            if self._records_file is not None:
+                self._records_file.flush()
+            with open(jsonl_path, 'rb') as f:
                 for line in f:
+                    if not line.strip():
+                        continue
                     try:
-                        results.append(json.loads(line))
+                        yield json_loads(line)
                     except json.JSONDecodeError as e:
                         self.logger.error(f"Error decoding result: {str(e)}")
-                        
-            self.logger.info(f"Loaded {len(results)} results from {jsonl_path}")
-            return results
+            return
         
         # If JSONL file doesn't exist, try loading individual files
-        for filename in os.listdir(self.output_dir):
+        for filename in sorted(os.listdir(self.output_dir)):
             if filename.endswith(".json") and filename != "all_results.json":
                 file_path = os.path.join(self.output_dir, filename)
                 try:
-                    with open(file_path, 'r') as f:
-                        results.append(json.load(f))
+                    with open(file_path, 'rb') as f:
+                        result = json_loads(f.read())
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Error decoding result file {filename}: {str(e)}")
-                    
-        self.logger.info(f"Loaded {len(results)} results from individual files")
-        
-        return results
+                    continue
+                yield result
     
-    def get_run_summary_stats(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_run_summary_stats(self, results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate summary statistics specifically for the four-run experiments.
         
         This provides basic analysis of run completion rates and success/failure stats.
         
         Args:
-            results: List of test results in the four-run format
+            results: Test results in the four-run format (a list, or iter_results() to
+                summarize a large suite without loading it)
             
         Returns:
             Dictionary with summary statistics
         """
         summary = {
-            "total_experiments": len(results),
+            "total_experiments": 0,
             "runs": {
                 "run_1": {"completed": 0, "failed": 0},
                 "run_2": {"completed": 0, "failed": 0},
@@ -176,6 +240,7 @@ class ResultLogger:
         }
         
         for result in results:
+            summary["total_experiments"] += 1
             # Count completed/failed runs
             for i in range(1, 5):
                 run_key = f"run_{i}"
@@ -124,6 +124,67 @@ def parse_args():
         help='Use mock models instead of real LLMs'
     )
     
+    parser.add_argument(
+        '--mock-sleep',
+        action='store_true',
+        help='Make mock models sleep for their simulated latency instead of only reporting it'
+    )
+    
+    parser.add_argument(
+        '--parallel-cloud-runs',
+        action='store_true',
+        help='Execute Run 1 and Run 2 (both CloudLLM) concurrently for each test case'
+    )
+    
+    parser.add_argument(
+        '--overlap-cloud-edge-runs',
+        action='store_true',
+        help='Execute the CloudLLM runs (1 and 2) in the background while the EdgeLLM runs (3 and 4) execute'
+    )
+    
+    parser.add_argument(
+        '--max-concurrent-runs',
+        type=int,
+        default=1,
+        help='Number of test case/hardware profile/EdgeLLM combinations to execute concurrently (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--cache-llm-responses',
+        action='store_true',
+        help='Reuse completions for identical teacher-request/question/student-answer prompts within a suite'
+    )
+    
+    parser.add_argument(
+        '--llm-cache-path',
+        type=str,
+        help='File to persist the LLM response cache in across invocations (implies --cache-llm-responses)'
+    )
+    
+    parser.add_argument(
+        '--stream-json-outputs',
+        action='store_true',
+        help='Stream JSON-mode EdgeLLM and OpenAI calls and stop generation once the JSON object is complete'
+    )
+    
+    parser.add_argument(
+        '--edge-prompt-cache',
+        action='store_true',
+        help='Ask the EdgeLLM server to reuse the KV cache of shared prompt prefixes (llama.cpp cache_prompt)'
+    )
+    
+    parser.add_argument(
+        '--edge-batch-concurrency',
+        type=int,
+        help='Maximum concurrent EdgeLLM requests when validation stages are sent as one batch (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--shared-system-prompt',
+        action='store_true',
+        help='Start every LLM call with the same pipeline system prompt so prefix caches are shared across steps'
+    )
+    
     parser.add_argument(
         '--openai-api-key',
         type=str,
@@ -194,12 +255,23 @@ def main():
             log_level=args.log_level,
             lm_studio_url=lm_studio_url,
             mock_models=args.mock_models,
+            mock_sleep=args.mock_sleep,
             openai_api_key=openai_api_key,
-            anthropic_api_key=anthropic_api_key
+            anthropic_api_key=anthropic_api_key,
+            parallel_cloud_runs=args.parallel_cloud_runs,
+            overlap_cloud_and_edge_runs=args.overlap_cloud_edge_runs,
+            max_concurrent_runs=args.max_concurrent_runs,
+            cache_llm_responses=args.cache_llm_responses,
+            stream_json_outputs=args.stream_json_outputs,
+            edge_prompt_cache=args.edge_prompt_cache,
+            edge_batch_concurrency=args.edge_batch_concurrency,
+            shared_system_prompt=args.shared_system_prompt,
+            llm_cache_path=args.llm_cache_path
         )
         
         # Run test suite
-        results = runner.run_test_suite()
+        with runner:
+            results = runner.run_test_suite()
         
         # Save results to output file
         timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -6,23 +6,78 @@ based on the TestOrchestrationPhase1MultiLLM_Revised algorithm specified in
 PROMPT_ENGINEERING.md (Sec 2.7).
 """
 
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import math
 import os
 import re
+import shelve
+import statistics
+import threading
 import time
+from collections import ChainMap
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Optional: vectorized summary statistics (falls back to the statistics module)
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Local application imports
 from .config_loader import ConfigLoader
 from .constraint_enforcer import ConstraintEnforcer
 from .evaluation_engine import EvaluationEngine
-from .metrics_collector import MetricsCollector
+from .json_utils import find_json_spans, json_dumps, json_loads, parse_llm_json_output
+from .metrics_collector import MetricsCollector, RunStatusTable
 from .model_manager import ModelManager
 from .result_logger import ResultLogger
 from .template_engine import TemplateEngine
 
+# Static instructions sent as the system prompt so every call shares a byte-identical,
+# provider-cacheable prefix; only the short per-test-case details follow in the user prompt.
+SIMPLE_QUESTION_SYSTEM_PROMPT = """Generate a single, clear question about the given topic, suitable for the given grade level.
+The question should relate to the given objective.
+
+Your question should be direct, focused on the topic, and appropriate for the grade level.
+Do not provide additional context or explanations - just the question itself."""
+
+STUDENT_ANSWER_SYSTEM_PROMPT = """Answer the following question as if you were a student.
+Write approximately the requested number of words, in the voice of the given student profile."""
+
+DIRECT_VALIDATION_SYSTEM_PROMPT = """Evaluate this student answer to a question. Return ONLY valid JSON without markdown.
+Evaluate if the answer is relevant to the question and the information is accurate.
+Output MUST be valid JSON with this exact structure: {"passed": true/false, "score": 0.7, "feedback": "Your feedback here"}
+
+The "passed" field must be true or false.
+The "score" field must be a number between 0 and 1.
+The "feedback" field must be a string with your evaluation.
+
+IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or explanations."""
+
+# The four runs executed per (test case, hardware profile, EdgeLLM) combination
+RUN_KEYS = ("run_1", "run_2", "run_3", "run_4")
+
+# Characters replaced when building run IDs (which are also used as result file names)
+RUN_ID_UNSAFE_CHARS = re.compile(r'[^a-zA-Z0-9_\-]')
+
+# Splits a test case topic into words for the topic consistency check
+TOPIC_WORD_PATTERN = re.compile(r"\w+")
+
+# Generation parameters for CloudLLM interactions called without explicit params
+DEFAULT_CLOUD_LLM_PARAMS = {"temperature": 0.7}
+
+# Optional preamble shared by every LLM call in a run (see shared_system_prompt); placed first in
+# the system prompt so all steps of a run share the same cacheable prefix.
+PIPELINE_SYSTEM_PROMPT = """You are one component of the EdgePrompt evaluation pipeline, which generates and evaluates educational content for primary and secondary school students.
+Follow the task instructions in the user message exactly and respond only in the format they request."""
+
 
 class RunnerCore:
     """
@@ -33,10 +88,26 @@ class RunnerCore:
     Follows SOLID principles where each component has a clear responsibility.
     """
     
+    # Number of distinct LLM outputs whose parsed JSON is memoized (see _parse_json_text)
+    JSON_PARSE_CACHE_SIZE = 1024
+    # Calls at or below this temperature are near-deterministic, so they are cached whenever
+    # response caching is enabled, even for steps not marked cacheable
+    DETERMINISTIC_TEMPERATURE_MAX = 0.15
+    
     def __init__(self, config_path: str, output_dir: str, log_level: str = "INFO",
                 lm_studio_url: Optional[str] = None, mock_models: bool = False,
                  openai_api_key: Optional[str] = None,
-                anthropic_api_key: Optional[str] = None):
+                anthropic_api_key: Optional[str] = None,
+                parallel_cloud_runs: bool = False,
+                cache_llm_responses: bool = False,
+                stream_json_outputs: bool = False,
+                overlap_cloud_and_edge_runs: bool = False,
+                shared_system_prompt: bool = False,
+                llm_cache_path: Optional[str] = None,
+                max_concurrent_runs: int = 1,
+                edge_prompt_cache: bool = False,
+                edge_batch_concurrency: Optional[int] = None,
+                mock_sleep: bool = False):
         """
         Initialize the RunnerCore and all its components.
 
@@ -50,6 +121,31 @@ class RunnerCore:
             mock_models: If True, use mock models instead of real LLMs.
             openai_api_key: API key for OpenAI (CloudLLM).
             anthropic_api_key: API key for Anthropic (CloudLLM and Proxy Evaluation).
+            parallel_cloud_runs: If True, execute Run 1 and Run 2 (both CloudLLM) concurrently.
+            cache_llm_responses: If True, reuse completions for identical teacher-request,
+                structured-question and student-answer prompts, and for any low-temperature call
+                (e.g. the direct JSON validation fallback), within a test suite instead of
+                calling the LLM again.
+            stream_json_outputs: If True, stream JSON-mode EdgeLLM (LM Studio) and OpenAI CloudLLM
+                calls and stop generation once the JSON object is complete.
+            overlap_cloud_and_edge_runs: If True, execute the CloudLLM runs (1 and 2) in the
+                background while the EdgeLLM runs (3 and 4) execute. Cloud calls are network-bound,
+                so this does not compete with the edge model for local compute.
+            shared_system_prompt: If True, prepend PIPELINE_SYSTEM_PROMPT to the system prompt of
+                every LLM call so all steps share a cacheable prefix (changes the prompts sent).
+            llm_cache_path: Optional file to persist the response cache in (implies
+                cache_llm_responses), so re-running a suite reuses completions from earlier runs.
+            max_concurrent_runs: Number of (test case, hardware profile, EdgeLLM) combinations
+                executed concurrently. Values above 1 overlap network-bound calls across runs but
+                share the EdgeLLM server between them, which affects measured edge latency.
+            edge_prompt_cache: If True, ask the EdgeLLM (LM Studio/llama.cpp) server to reuse the KV
+                cache of prompt prefixes shared between consecutive calls. Cached prompt tokens are
+                reported as cached_input_tokens in the call metrics.
+            edge_batch_concurrency: Maximum number of concurrent EdgeLLM requests when a validation
+                sequence with "parallelStages" sends its stage prompts as one batch (default:
+                ModelManager.EDGE_BATCH_CONCURRENCY). Match it to the server's parallel slots.
+            mock_sleep: If True (with mock_models), mock models sleep for their simulated latency
+                instead of returning immediately, e.g. to exercise the concurrency options.
         """
         self.logger = self._setup_logging(log_level)
         self.logger.info(f"Initializing RunnerCore with config: {config_path}")
@@ -58,12 +154,36 @@ class RunnerCore:
         self.config_path = config_path
         self.output_dir = output_dir
         self.mock_models = mock_models
+        self.parallel_cloud_runs = parallel_cloud_runs
+        self.cache_llm_responses = cache_llm_responses or bool(llm_cache_path)
+        self.overlap_cloud_and_edge_runs = overlap_cloud_and_edge_runs
+        self.shared_system_prompt = shared_system_prompt
+        self.max_concurrent_runs = max(1, max_concurrent_runs)
+        # Exact-match completion cache (see _execute_cloud_llm_interaction / _execute_edge_llm),
+        # kept on disk across invocations when llm_cache_path is given
+        self._response_cache_persistent = bool(llm_cache_path)
+        self._response_cache = shelve.open(llm_cache_path) if llm_cache_path else {}
+        self._response_cache_lock = threading.Lock()
+        self._response_cache_stats = {"hits": 0, "misses": 0}
+        # Evaluation criteria serialized once per test case ID within a suite (see _get_criteria_str)
+        self._criteria_str_cache: Dict[Any, str] = {}
+        self._criteria_str_cache_lock = threading.Lock()
         
         # Log key settings
         self.logger.info(f"Output directory: {output_dir}")
         self.logger.info(f"Log level: {log_level}")
         if lm_studio_url: self.logger.info(f"Using LM Studio URL: {lm_studio_url}")
         self.logger.info(f"Mock models enabled: {mock_models}")
+        if mock_models and mock_sleep: self.logger.info("Mock models sleep for their simulated latency")
+        self.logger.info(f"Parallel CloudLLM runs: {parallel_cloud_runs}")
+        self.logger.info(f"Overlap CloudLLM and EdgeLLM runs: {overlap_cloud_and_edge_runs}")
+        self.logger.info(f"Shared pipeline system prompt: {shared_system_prompt}")
+        self.logger.info(f"Max concurrent runs: {self.max_concurrent_runs}")
+        self.logger.info(f"LLM response cache enabled: {self.cache_llm_responses}")
+        if llm_cache_path: self.logger.info(f"Persisting LLM response cache to: {llm_cache_path}")
+        self.logger.info(f"Streaming JSON outputs: {stream_json_outputs}")
+        self.logger.info(f"EdgeLLM prompt cache: {edge_prompt_cache}")
+        if edge_batch_concurrency: self.logger.info(f"EdgeLLM batch concurrency: {edge_batch_concurrency}")
         if openai_api_key: self.logger.debug("OpenAI API key provided.")
         if anthropic_api_key: self.logger.debug("Anthropic API key provided.")
 
@@ -82,7 +202,11 @@ class RunnerCore:
                 metrics_collector=self.metrics_collector, # Pass collector instance
                 lm_studio_url=lm_studio_url,
                 openai_api_key=openai_api_key,
-                anthropic_api_key=anthropic_api_key
+                anthropic_api_key=anthropic_api_key,
+                stream_json_outputs=stream_json_outputs,
+                edge_prompt_cache=edge_prompt_cache,
+                edge_batch_concurrency=edge_batch_concurrency,
+                mock_sleep=mock_sleep
             )
             # EvaluationEngine needs TemplateEngine and MetricsCollector
             self.evaluation_engine = EvaluationEngine(
@@ -93,6 +217,12 @@ class RunnerCore:
             # ConstraintEnforcer and ResultLogger have simple init
             self.constraint_enforcer = ConstraintEnforcer()
             self.result_logger = ResultLogger(output_dir)
+            # Result files are written on a single background thread so the run loop
+            # never blocks on serialization/disk I/O; one worker keeps writes ordered.
+            self._log_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="result-writer"
+            )
+            self._log_pending: List[concurrent.futures.Future] = []
         
         except Exception as e:
             self.logger.critical(f"Failed to initialize core components: {e}", exc_info=True)
@@ -134,7 +264,7 @@ class RunnerCore:
         try:
             test_suite = self.config_loader.load_test_suite()
             suite_id = test_suite.get('test_suite_id', 'unknown_suite')
-            self.logger.info(f"Loaded test suite: {suite_id}")
+            self.logger.info("Loaded test suite: %s", suite_id)
         except Exception as e:
             return self._log_and_return_error(f"Failed to load test suite from {self.config_path}", e)
 
@@ -150,7 +280,7 @@ class RunnerCore:
 
         # Initialize CloudLLM
         try:
-             self.logger.info(f"Initializing CloudLLM model: {cloud_llm_model_id}")
+             self.logger.info("Initializing CloudLLM model: %s", cloud_llm_model_id)
              cloud_llm_model_data = self.model_manager.initialize_cloud_llm(
                  cloud_llm_model_id, mock_mode=self.mock_models
              )
@@ -158,130 +288,256 @@ class RunnerCore:
             return self._log_and_return_error(f"Failed to initialize CloudLLM model {cloud_llm_model_id}", e)
 
         # --- Algorithm Steps 3-14: Execute the four-run test structure ---
-        test_suite_results = []
+        # Full run results are streamed to disk by the ResultLogger; only a columnar table
+        # of run statuses, scores and latencies is kept in memory for the end-of-suite summary.
+        run_status_records = RunStatusTable(RUN_KEYS)
         run_counter = 0
 
         # Get run parameters from the updated configuration
         run_parameters = test_suite.get('run_parameters', {})
         if not run_parameters:
             return self._log_and_return_error("No run parameters defined in test suite.")
-        
-        self.logger.info(f"Executing four-run test structure")
 
-        for test_case in test_suite.get('test_cases', []):
-            test_case_id = test_case.get('id', f'unknown_case_{run_counter}')
-            self.logger.info(f"--- Running Test Case: {test_case_id} ---")
-            
-            # Generate teacher request for all runs ONCE per test case
-            # This ensures all runs use the same topic and constraints
-            self.logger.info(f"Generating shared teacher request for test case: {test_case_id}")
-            teacher_request_result = self._step_teacher_request(test_case, cloud_llm_model_data)
-            if teacher_request_result.get("error"):
-                self.logger.error(f"Failed to generate teacher request for test case {test_case_id}: {teacher_request_result.get('error')}")
-                continue
-                
-            teacher_request_content = teacher_request_result.get("parsed_content")
-            # Store the teacher request in the test case to be used by all runs
-            test_case["shared_teacher_request"] = teacher_request_content
-            
-            # Log the topic for verification 
-            self.logger.info(f"Topic from original test case: {test_case.get('variables', {}).get('topic')}")
-            self.logger.info(f"Topic from shared teacher request: {teacher_request_content.get('topic')}")
-
-            # Hardware profiles are conceptual labels in Phase 1
-            for hardware_profile in test_suite.get('hardware_profiles', ["sim_unconstrained"]):
-                 self.logger.debug(f"Using conceptual hardware profile: {hardware_profile}")
-
-                 for edge_llm_model_id in edge_llm_model_ids:
-                     self.logger.info(f"--- Using EdgeLLM model: {edge_llm_model_id} ---")
-                     
-                     run_counter += 1
-                     # Create unique run ID including suite, case, model, profile, counter
-                     run_id = f"{suite_id}_{test_case_id}_{edge_llm_model_id}_{hardware_profile}_{run_counter}"
-                     run_id = re.sub(r'[^a-zA-Z0-9_\-]', '_', run_id) # Sanitize ID
-
-                     # Initialize EdgeLLM for this specific run configuration
-                     try:
-                         edge_llm_model_data = self.model_manager.initialize_edge_llm(
-                             edge_llm_model_id, mock_mode=self.mock_models
-                         )
-                     except Exception as e:
-                         self.logger.error(f"Failed to initialize EdgeLLM model {edge_llm_model_id} for run {run_id}", exc_info=True)
-                         run_data = self._create_run_data_struct(run_id, test_case_id, cloud_llm_model_id, edge_llm_model_id, hardware_profile)
-                         run_data["error"] = f"EdgeLLM Initialization Failed: {e}"
-                         test_suite_results.append(run_data)
-                         self.result_logger.log_result(run_data)
-                         continue # Skip to next EdgeLLM model
-
-                     # Prepare run data structure
-                     run_data = self._create_run_data_struct(run_id, test_case_id, cloud_llm_model_id, edge_llm_model_id, hardware_profile)
-
-                     try:
-                         # --- Step 7: Generate Input Stimulus ---
-                         # For simplicity, we're using the test case directly as our input stimulus
-                         # In a more complex scenario, we could generate synthetic data using cloud_llm
-                         input_stimulus = test_case
-                         run_data["input_stimulus"] = input_stimulus
-
-                         # --- Step 8: Initialize Results Structure ---
-                         # This is already handled in _create_run_data_struct
-
-                         # --- Step 9: Execute Run 1 (CloudLLM, SingleTurn_Direct) ---
-                         self.logger.info(f"[Run {run_id}] Run 1: Executing CloudLLM with SingleTurn_Direct...")
-                         run_data["run_1"] = self._run_cloud_baseline(
-                             test_case, cloud_llm_model_data
-                         )
-
-                         # --- Step 10: Execute Run 2 (CloudLLM, MultiTurn_EdgePrompt) ---
-                         validation_sequence_id = run_parameters.get('run_2', {}).get('validation_sequence', 'basic_validation_sequence')
-                         self.logger.info(f"[Run {run_id}] Run 2: Executing CloudLLM with MultiTurn_EdgePrompt...")
-                         run_data["run_2"] = self._run_cloud_edgeprompt(
-                             test_case, cloud_llm_model_data, validation_sequence_id
-                         )
-
-                         # --- Step 11: Execute Run 3 (EdgeLLM, SingleTurn_Direct) ---
-                         self.logger.info(f"[Run {run_id}] Run 3: Executing EdgeLLM with SingleTurn_Direct...")
-                         run_data["run_3"] = self._run_edge_baseline(
-                             test_case, edge_llm_model_data
-                         )
-
-                         # --- Step 12: Execute Run 4 (EdgeLLM, MultiTurn_EdgePrompt) ---
-                         validation_sequence_id = run_parameters.get('run_4', {}).get('validation_sequence', 'basic_validation_sequence')
-                         self.logger.info(f"[Run {run_id}] Run 4: Executing EdgeLLM with MultiTurn_EdgePrompt...")
-                         run_data["run_4"] = self._run_edge_edgeprompt(
-                             test_case, edge_llm_model_data, validation_sequence_id
-                         )
-
-                         # Log topic consistency verification for this run
-                         self._verify_topic_consistency(run_data, test_case)
-
-                     except Exception as e:
-                         self.logger.error(f"Critical error during run execution for run {run_id}", exc_info=True)
-                         run_data["error"] = f"Run Execution Failed: {e}"
-                     finally:
-                          # --- Step 13: Log Result ---
-                          test_suite_results.append(run_data)
-                          self.result_logger.log_result(run_data)
-                          self.logger.info(f"[Run {run_id}] Completed and logged.")
+        # Per-run settings are fixed for the whole suite, so resolve them once
+        run_2_params = run_parameters.get('run_2', {})
+        run_4_params = run_parameters.get('run_4', {})
+        run_settings = {
+            "run_2_validation_sequence_id": run_2_params.get('validation_sequence', 'basic_validation_sequence'),
+            "run_2_early_exit": run_2_params.get('early_exit_on_validation_fail', False),
+            "run_2_constraints_first": run_2_params.get('skip_validation_on_fatal_constraint', False),
+            "run_4_validation_sequence_id": run_4_params.get('validation_sequence', 'basic_validation_sequence'),
+            "run_4_early_exit": run_4_params.get('early_exit_on_validation_fail', False),
+            "run_4_constraints_first": run_4_params.get('skip_validation_on_fatal_constraint', False),
+            "run_4_fuse_question_and_answer": run_4_params.get('fuse_question_and_answer', False)
+        }
+
+        # Optional suite-level "concurrency" settings enable the same execution modes as the
+        # constructor/CLI options; either source can turn a mode on
+        concurrency = test_suite.get('concurrency', {})
+        run_settings["parallel_cloud_runs"] = self.parallel_cloud_runs or bool(concurrency.get('parallel_cloud_runs', False))
+        run_settings["overlap_cloud_and_edge_runs"] = (self.overlap_cloud_and_edge_runs
+                                                       or bool(concurrency.get('overlap_cloud_and_edge_runs', False)))
+        max_concurrent_runs = max(self.max_concurrent_runs, int(concurrency.get('max_concurrent_runs', 1)))
+        if concurrency:
+            self.logger.info("Suite concurrency: parallel CloudLLM runs=%s, overlap CloudLLM/EdgeLLM runs=%s, max concurrent runs=%s",
+                             run_settings["parallel_cloud_runs"], run_settings["overlap_cloud_and_edge_runs"], max_concurrent_runs)
+        
+        self.logger.info("Executing four-run test structure")
+
+        # Flatten (hardware_profile x edge_llm x test_case) so EdgeLLM initialization for
+        # the next combination can be prefetched while the current one executes. Test cases
+        # are innermost so consecutive runs use the same EdgeLLM and the local server does
+        # not have to swap model weights between test cases.
+        # Hardware profiles are conceptual labels in Phase 1.
+        hardware_profiles = test_suite.get('hardware_profiles', ["sim_unconstrained"])
+        run_combinations = list(itertools.product(
+            hardware_profiles, edge_llm_model_ids, test_suite.get('test_cases', [])
+        ))
+
+        # Runs 1 and 2 are independent CloudLLM pipelines for the same test case, so they
+        # can optionally overlap their network-bound calls on a two-worker pool, and/or run
+        # in the background while the EdgeLLM runs execute.
+        # With max_concurrent_runs > 1, whole combinations also execute on a bounded pool;
+        # shared teacher requests are still generated on this thread, once per test case.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="edge-llm-init") as init_executor, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="cloud-run") as cloud_executor, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_runs, thread_name_prefix="run") as run_executor:
+            # One initialization per EdgeLLM model for the whole suite; later combinations
+            # using the same model reuse its future (including a failed initialization).
+            edge_llm_init_futures: Dict[str, concurrent.futures.Future] = {}
+
+            def prefetch_edge_llm(index: int) -> Optional[concurrent.futures.Future]:
+                if index >= len(run_combinations):
+                    return None
+                model_id = run_combinations[index][1]
+                if model_id not in edge_llm_init_futures:
+                    edge_llm_init_futures[model_id] = init_executor.submit(
+                        self.model_manager.initialize_edge_llm,
+                        model_id, mock_mode=self.mock_models
+                    )
+                return edge_llm_init_futures[model_id]
+
+            next_init_future = prefetch_edge_llm(0)
+            # Shared teacher request outcome per test case (keyed by id(test_case)): True if it failed
+            teacher_request_failed: Dict[int, bool] = {}
+            pending_runs: List[concurrent.futures.Future] = []
+
+            for combo_index, (hardware_profile, edge_llm_model_id, test_case) in enumerate(run_combinations):
+                # Keep exactly one EdgeLLM initialization in flight ahead of execution
+                init_future = next_init_future
+                next_init_future = prefetch_edge_llm(combo_index + 1)
+
+                test_case_id = test_case.get('id', f'unknown_case_{run_counter}')
+                self.logger.info("--- Running Test Case: %s ---", test_case_id)
+                if id(test_case) not in teacher_request_failed:
+                    # Generate teacher request for all runs ONCE per test case
+                    # This ensures all runs use the same topic and constraints
+                    self.logger.info("Generating shared teacher request for test case: %s", test_case_id)
+                    teacher_request_result = self._step_teacher_request(test_case, cloud_llm_model_data)
+                    teacher_request_failed[id(test_case)] = bool(teacher_request_result.get("error"))
+                    if teacher_request_failed[id(test_case)]:
+                        self.logger.error("Failed to generate teacher request for test case %s: %s", test_case_id, teacher_request_result.get('error'))
+                    else:
+                        teacher_request_content = teacher_request_result.get("parsed_content")
+                        # Store the teacher request in the test case to be used by all runs
+                        test_case["shared_teacher_request"] = teacher_request_content
+
+                        # Log the topic for verification
+                        self.logger.info("Topic from original test case: %s", test_case.get('variables', {}).get('topic'))
+                        self.logger.info("Topic from shared teacher request: %s", teacher_request_content.get('topic'))
+
+                if teacher_request_failed[id(test_case)]:
+                    continue
+
+                self.logger.debug("Using conceptual hardware profile: %s", hardware_profile)
+                self.logger.info("--- Using EdgeLLM model: %s ---", edge_llm_model_id)
+
+                run_counter += 1
+                # Create unique run ID including suite, case, model, profile, counter
+                run_id = f"{suite_id}_{test_case_id}_{edge_llm_model_id}_{hardware_profile}_{run_counter}"
+                run_id = RUN_ID_UNSAFE_CHARS.sub('_', run_id) # Sanitize ID
+
+                run_args = (run_id, test_case, test_case_id, hardware_profile,
+                            cloud_llm_model_id, cloud_llm_model_data, edge_llm_model_id, init_future,
+                            run_settings, cloud_executor)
+                if max_concurrent_runs > 1:
+                    pending_runs.append(run_executor.submit(self._execute_run_combination, *run_args))
+                else:
+                    run_status_records.add(self._execute_run_combination(*run_args))
+
+            # Collect concurrent runs in submission order so the summary does not depend on timing
+            for run_future in pending_runs:
+                run_status_records.add(run_future.result())
+
+        # Make sure every queued result file is on disk before summarizing
+        self._wait_for_result_logs()
+        self.result_logger.close()
+        self.logger.info("Template render cache: %s", self.template_engine.cache_info())
+        self.template_engine.clear_cache()
+        with self._criteria_str_cache_lock:
+            self._criteria_str_cache.clear()
+        with self._response_cache_lock:
+            if self._response_cache_persistent:
+                self._response_cache.sync()
+            else:
+                self._response_cache.clear()
+            self.logger.info("LLM response cache: %s", self._response_cache_stats)
 
         # --- Cleanup: Unload models (optional) ---
         self.model_manager.unload_model(cloud_llm_model_id, model_type="cloud_llm")
         for edge_llm_id in edge_llm_model_ids:
             self.model_manager.unload_model(edge_llm_id, model_type="edge_llm")
 
-        self.logger.info(f"=== Test Suite Execution Complete. Total runs logged: {len(test_suite_results)} ===")
+        self.logger.info("=== Test Suite Execution Complete. Total runs logged: %s ===", len(run_status_records))
 
         # --- Step 14: Analyze Results (Basic Summary) ---
         # Detailed analysis is performed by the analyze_results.py script.
         # This provides a quick summary log.
-        analysis_summary = self._create_analysis_summary(suite_id, run_counter, test_suite_results)
-        self.result_logger.log_aggregate_results(test_suite_results, f"{suite_id}_raw_results")
+        # Raw results were already streamed to all_results.jsonl as each run completed.
+        analysis_summary = self._create_analysis_summary(suite_id, run_counter, run_status_records)
         self.result_logger.log_aggregate_results(analysis_summary, f"{suite_id}_analysis_summary")
 
         return analysis_summary # Return summary, raw results are in files
 
     # --- Four Run Structure Methods ---
 
+    def _execute_run_combination(self, run_id: str, test_case: Dict[str, Any], test_case_id: str, hardware_profile: str,
+                                 cloud_llm_model_id: str, cloud_llm_model_data: Dict[str, Any], edge_llm_model_id: str,
+                                 init_future: concurrent.futures.Future, run_settings: Dict[str, Any],
+                                 cloud_executor: concurrent.futures.Executor) -> Dict[str, Any]:
+        """
+        Execute the four runs for one (test case, hardware profile, EdgeLLM) combination and
+        queue the result for logging. Safe to call from run-pool worker threads.
+
+        Returns:
+            The status record for the run (see _summarize_run_status).
+        """
+        # Collect the (prefetched) EdgeLLM initialization for this run configuration
+        try:
+            edge_llm_model_data = init_future.result()
+        except Exception as e:
+            err_msg = self._log_failure(f"Failed to initialize EdgeLLM model {edge_llm_model_id} for run {run_id}", e)
+            run_data = self._create_run_data_struct(run_id, test_case_id, cloud_llm_model_id, edge_llm_model_id, hardware_profile)
+            run_data["error"] = f"EdgeLLM Initialization Failed: {err_msg}"
+            self._submit_result_log(run_data)
+            return self._summarize_run_status(run_data)
+
+        # Prepare run data structure
+        run_data = self._create_run_data_struct(run_id, test_case_id, cloud_llm_model_id, edge_llm_model_id, hardware_profile)
+
+        try:
+            # --- Step 7: Generate Input Stimulus ---
+            # For simplicity, we're using the test case directly as our input stimulus
+            # In a more complex scenario, we could generate synthetic data using cloud_llm
+            input_stimulus = test_case
+            run_data["input_stimulus"] = input_stimulus
+
+            # --- Step 8: Initialize Results Structure ---
+            # This is already handled in _create_run_data_struct
+
+            # Runs are kept grouped by executor (1-2 on CloudLLM, then 3-4 on EdgeLLM)
+            # so calls sharing a prompt prefix hit the same model back-to-back and
+            # can reuse its prefix/KV cache.
+
+            # --- Step 9: Execute Run 1 (CloudLLM, SingleTurn_Direct) ---
+            self.logger.info("[Run %s] Run 1: Executing CloudLLM with SingleTurn_Direct...", run_id)
+            run_1_args = (test_case, cloud_llm_model_data)
+
+            # --- Step 10: Execute Run 2 (CloudLLM, MultiTurn_EdgePrompt) ---
+            self.logger.info("[Run %s] Run 2: Executing CloudLLM with MultiTurn_EdgePrompt...", run_id)
+            run_2_args = (test_case, cloud_llm_model_data, run_settings["run_2_validation_sequence_id"],
+                          run_settings["run_2_early_exit"], run_settings["run_2_constraints_first"])
+
+            if run_settings["parallel_cloud_runs"]:
+                run_1_future = cloud_executor.submit(self._run_cloud_baseline, *run_1_args)
+                run_2_future = cloud_executor.submit(self._run_cloud_edgeprompt, *run_2_args)
+                collect_cloud_runs = lambda: (run_1_future.result(), run_2_future.result())
+            elif run_settings["overlap_cloud_and_edge_runs"]:
+                cloud_runs_future = cloud_executor.submit(self._run_cloud_runs, run_1_args, run_2_args)
+                collect_cloud_runs = cloud_runs_future.result
+            else:
+                cloud_runs = self._run_cloud_runs(run_1_args, run_2_args)
+                collect_cloud_runs = lambda: cloud_runs
+
+            if not run_settings["overlap_cloud_and_edge_runs"]:
+                run_data["run_1"], run_data["run_2"] = collect_cloud_runs()
+
+            # --- Step 11: Execute Run 3 (EdgeLLM, SingleTurn_Direct) ---
+            self.logger.info("[Run %s] Run 3: Executing EdgeLLM with SingleTurn_Direct...", run_id)
+            run_data["run_3"] = self._run_edge_baseline(
+                test_case, edge_llm_model_data
+            )
+
+            # --- Step 12: Execute Run 4 (EdgeLLM, MultiTurn_EdgePrompt) ---
+            self.logger.info("[Run %s] Run 4: Executing EdgeLLM with MultiTurn_EdgePrompt...", run_id)
+            run_data["run_4"] = self._run_edge_edgeprompt(
+                test_case, edge_llm_model_data, run_settings["run_4_validation_sequence_id"],
+                early_exit_on_validation_fail=run_settings["run_4_early_exit"],
+                skip_validation_on_fatal_constraint=run_settings["run_4_constraints_first"],
+                fuse_question_and_answer=run_settings["run_4_fuse_question_and_answer"]
+            )
+
+            if run_settings["overlap_cloud_and_edge_runs"]:
+                # CloudLLM runs were executing in the background during Runs 3 and 4
+                run_data["run_1"], run_data["run_2"] = collect_cloud_runs()
+
+            # Log topic consistency verification for this run
+            self._verify_topic_consistency(run_data, test_case)
+
+        except Exception as e:
+            err_msg = self._log_failure(f"Critical error during run execution for run {run_id}", e)
+            run_data["error"] = f"Run Execution Failed: {err_msg}"
+        finally:
+            # --- Step 13: Log Result ---
+            self._submit_result_log(run_data)
+            self.logger.info("[Run %s] Completed and queued for logging.", run_id)
+
+        return self._summarize_run_status(run_data)
+
+    def _run_cloud_runs(self, run_1_args: Tuple[Any, ...], run_2_args: Tuple[Any, ...]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Execute Run 1 and then Run 2 (both CloudLLM) and return their results."""
+        return self._run_cloud_baseline(*run_1_args), self._run_cloud_edgeprompt(*run_2_args)
+
     def _run_cloud_baseline(self, test_case: Dict[str, Any], cloud_llm_model_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute Run 1 (Cloud Baseline):
@@ -289,13 +545,13 @@ class RunnerCore:
         Similar to the previous Scenario B but using CloudLLM.
         """
         run_results = {"status": "started", "steps": {}}
-        all_metrics = [] # Collect metrics dict from each step
+        metrics_accumulator = self.metrics_collector.new_accumulator() # Sum metrics from each step
 
         try:
             # Step 1: Generate Simple, Unstructured Question (CloudLLM)
             question_result = self._step_generate_simple_question(test_case, cloud_llm_model_data)
             run_results["steps"]["generated_question"] = question_result
-            all_metrics.append(question_result.get("metrics"))
+            metrics_accumulator.add(question_result.get("metrics"))
             if question_result.get("error"): raise RuntimeError(f"Baseline Question Generation failed: {question_result['error']}")
             question_text = question_result.get("llm_output")
             if not question_text: raise ValueError("Baseline question text is empty.")
@@ -306,7 +562,7 @@ class RunnerCore:
             # Step 2: Simulate Student Answer (CloudLLM)
             student_answer_result = self._step_simulate_student_answer(question_text, context, test_case, cloud_llm_model_data)
             run_results["steps"]["student_answer"] = student_answer_result
-            all_metrics.append(student_answer_result.get("metrics"))
+            metrics_accumulator.add(student_answer_result.get("metrics"))
             if student_answer_result.get("error"): raise RuntimeError(f"Baseline Student Answer failed: {student_answer_result['error']}")
             
             student_answer_text = student_answer_result.get("llm_output")
@@ -317,7 +573,7 @@ class RunnerCore:
                 question_text, student_answer_text, test_case, cloud_llm_model_data
             )
             run_results["steps"]["baseline_evaluation"] = baseline_evaluation_result
-            all_metrics.append(baseline_evaluation_result.get("metrics"))
+            metrics_accumulator.add(baseline_evaluation_result.get("metrics"))
 
             # Step 4: Constraint Enforcement
             constraint_result = self._step_constraint_enforcement(student_answer_text, test_case)
@@ -334,22 +590,29 @@ class RunnerCore:
             run_results["status"] = "completed"
             
         except Exception as e:
-            self.logger.error(f"Error in Run 1 (Cloud Baseline) execution: {e}", exc_info=True)
+            err_msg = self._log_failure("Error in Run 1 (Cloud Baseline) execution", e)
             run_results["status"] = "failed"
-            run_results["error"] = f"Run 1 Failed: {e}"
+            run_results["error"] = f"Run 1 Failed: {err_msg}"
             
         # Aggregate metrics for entire run
-        run_results["total_metrics"] = self.metrics_collector.merge_metrics([m for m in all_metrics if m])
+        run_results["total_metrics"] = metrics_accumulator.finalize()
         return run_results
 
-    def _run_cloud_edgeprompt(self, test_case: Dict[str, Any], cloud_llm_model_data: Dict[str, Any], validation_sequence_id: str) -> Dict[str, Any]:
+    def _run_cloud_edgeprompt(self, test_case: Dict[str, Any], cloud_llm_model_data: Dict[str, Any], validation_sequence_id: str,
+                              early_exit_on_validation_fail: bool = False,
+                              skip_validation_on_fatal_constraint: bool = False) -> Dict[str, Any]:
         """
         Execute Run 2 (Cloud EdgePrompt):
         CloudLLM executor with MultiTurn_EdgePrompt method.
         Similar to the previous Scenario A but using CloudLLM.
+
+        When early_exit_on_validation_fail is set (run_parameters.run_2), a hard validation
+        failure (finalScore of 0) skips constraint enforcement and teacher review.
+        When skip_validation_on_fatal_constraint is set, constraint enforcement runs first and
+        a fatal violation (e.g., prohibited content) skips multi-stage validation.
         """
         run_results = {"status": "started", "steps": {}}
-        all_metrics = [] # Collect metrics dict from each step
+        metrics_accumulator = self.metrics_collector.new_accumulator() # Sum metrics from each step
 
         try:
             # Step 1: Use the shared Teacher Request generated earlier
@@ -361,7 +624,7 @@ class RunnerCore:
                 self.logger.warning("Shared teacher request not found in test case. Generating new request.")
                 teacher_request_result = self._step_teacher_request(test_case, cloud_llm_model_data)
                 run_results["steps"]["teacher_request"] = teacher_request_result
-                all_metrics.append(teacher_request_result.get("metrics"))
+                metrics_accumulator.add(teacher_request_result.get("metrics"))
                 if teacher_request_result.get("error"): raise RuntimeError(f"Teacher Request failed: {teacher_request_result['error']}")
                 teacher_request_content = teacher_request_result["parsed_content"]
             else:
@@ -379,7 +642,7 @@ class RunnerCore:
             # Step 2: Generate Question (CloudLLM)
             question_result = self._step_generate_structured_question(teacher_request_content, test_case, cloud_llm_model_data)
             run_results["steps"]["generated_question"] = question_result
-            all_metrics.append(question_result.get("metrics"))
+            metrics_accumulator.add(question_result.get("metrics"))
             if question_result.get("error"): raise RuntimeError(f"Generate Question failed: {question_result['error']}")
             question_text = question_result.get("llm_output")
             if not question_text: raise ValueError("Generated question text is empty.")
@@ -387,43 +650,62 @@ class RunnerCore:
             # Step 3: Simulate Student Answer (CloudLLM)
             student_answer_result = self._step_simulate_student_answer(question_text, teacher_request_content, test_case, cloud_llm_model_data)
             run_results["steps"]["student_answer"] = student_answer_result
-            all_metrics.append(student_answer_result.get("metrics"))
+            metrics_accumulator.add(student_answer_result.get("metrics"))
             if student_answer_result.get("error"): raise RuntimeError(f"Student Answer failed: {student_answer_result['error']}")
             
             answer_text = student_answer_result.get("llm_output")
             if not answer_text: raise ValueError("Generated answer text is empty.")
 
-            # Step 4: Perform Multi-Stage Validation
-            multi_stage_validation_result = self._step_multistage_validation(
-                question_text, answer_text, teacher_request_content, cloud_llm_model_data, validation_sequence_id
-            )
+            # Step 5 (hoisted): Constraint enforcement is local and cheap, so it can gate validation
+            constraint_result = None
+            if skip_validation_on_fatal_constraint:
+                constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
+                run_results["steps"]["constraint_enforcement"] = constraint_result
+
+            if constraint_result is not None and constraint_result.get("fatal", False):
+                self.logger.info("Run 2: Fatal constraint violation; skipping multi-stage validation.")
+                multi_stage_validation_result = self._fatal_constraint_validation_result()
+            else:
+                # Step 4: Perform Multi-Stage Validation
+                multi_stage_validation_result = self._step_multistage_validation(
+                    question_text, answer_text, teacher_request_content, cloud_llm_model_data, validation_sequence_id
+                )
             
             run_results["steps"]["multi_stage_validation"] = multi_stage_validation_result
-            all_metrics.append(multi_stage_validation_result.get("metrics"))
+            metrics_accumulator.add(multi_stage_validation_result.get("metrics"))
             if multi_stage_validation_result.get("error"): 
                 raise RuntimeError(f"Multi-stage Validation failed: {multi_stage_validation_result['error']}")
             
-            # Step 5: Constraint Enforcement
-            constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
-            run_results["steps"]["constraint_enforcement"] = constraint_result
-
-            # Step 6: Teacher Review (if validation/constraint issues)
-            if (not multi_stage_validation_result.get("isValid", True) or 
-                not constraint_result.get("passed", True)):
-                teacher_review_result = self._step_teacher_review(
-                    multi_stage_validation_result, constraint_result, 
-                    question_text, answer_text, cloud_llm_model_data
-                )
-                run_results["steps"]["teacher_review"] = teacher_review_result
-                all_metrics.append(teacher_review_result.get("metrics"))
+            if (constraint_result is None and early_exit_on_validation_fail
+                    and self._is_hard_validation_failure(multi_stage_validation_result)):
+                # Fast path: a hard validation failure decides the run, so skip the remaining steps
+                self.logger.info("Run 2: Validation failed with score 0; skipping constraint enforcement and teacher review.")
+                constraint_result = None
+                run_results["steps"]["constraint_enforcement"] = {"executed": False, "reason": "Early exit on validation failure"}
+                run_results["steps"]["teacher_review"] = {"executed": False, "reason": "Early exit on validation failure"}
             else:
-                run_results["steps"]["teacher_review"] = {"executed": False, "reason": "Validation and constraints passed"}
+                # Step 5: Constraint Enforcement (unless it already ran ahead of validation)
+                if constraint_result is None:
+                    constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
+                    run_results["steps"]["constraint_enforcement"] = constraint_result
+
+                # Step 6: Teacher Review (if validation/constraint issues)
+                if (not multi_stage_validation_result.get("isValid", True) or 
+                    not constraint_result.get("passed", True)):
+                    teacher_review_result = self._step_teacher_review(
+                        multi_stage_validation_result, constraint_result, 
+                        question_text, answer_text, cloud_llm_model_data
+                    )
+                    run_results["steps"]["teacher_review"] = teacher_review_result
+                    metrics_accumulator.add(teacher_review_result.get("metrics"))
+                else:
+                    run_results["steps"]["teacher_review"] = {"executed": False, "reason": "Validation and constraints passed"}
             
             # Store output and final decision
             run_results["output"] = answer_text
             run_results["final_decision"] = {
                 "passed_validation": multi_stage_validation_result.get("isValid", False),
-                "passed_constraints": constraint_result.get("passed", False),
+                "passed_constraints": constraint_result.get("passed", False) if constraint_result is not None else None,
                 "final_score": multi_stage_validation_result.get("finalScore", 0.0),
                 "feedback": multi_stage_validation_result.get("aggregateFeedback", "")
             }
@@ -431,12 +713,12 @@ class RunnerCore:
             run_results["status"] = "completed"
             
         except Exception as e:
-            self.logger.error(f"Error in Run 2 (Cloud EdgePrompt) execution: {e}", exc_info=True)
+            err_msg = self._log_failure("Error in Run 2 (Cloud EdgePrompt) execution", e)
             run_results["status"] = "failed"
-            run_results["error"] = f"Run 2 Failed: {e}"
+            run_results["error"] = f"Run 2 Failed: {err_msg}"
             
         # Aggregate metrics for entire run
-        run_results["total_metrics"] = self.metrics_collector.merge_metrics([m for m in all_metrics if m])
+        run_results["total_metrics"] = metrics_accumulator.finalize()
         
         # Add quality metrics compared to reference (Run 1)
         # Note: Detailed quality analysis is typically done by the analysis script
@@ -455,13 +737,13 @@ class RunnerCore:
         Similar to the previous Scenario B but using EdgeLLM.
         """
         run_results = {"status": "started", "steps": {}}
-        all_metrics = [] # Collect metrics dict from each step
+        metrics_accumulator = self.metrics_collector.new_accumulator() # Sum metrics from each step
 
         try:
             # Step 1: Generate Simple, Unstructured Question (EdgeLLM)
             question_result = self._step_generate_simple_question_edge(test_case, edge_llm_model_data)
             run_results["steps"]["generated_question"] = question_result
-            all_metrics.append(question_result.get("metrics"))
+            metrics_accumulator.add(question_result.get("metrics"))
             if question_result.get("error"): raise RuntimeError(f"Baseline Question Generation failed: {question_result['error']}")
             question_text = question_result.get("generated_text")
             if not question_text: raise ValueError("Baseline question text is empty.")
@@ -472,7 +754,7 @@ class RunnerCore:
             # Step 2: Simulate Student Answer (EdgeLLM)
             student_answer_result = self._step_simulate_student_answer_edge(question_text, context, test_case, edge_llm_model_data)
             run_results["steps"]["student_answer"] = student_answer_result
-            all_metrics.append(student_answer_result.get("metrics"))
+            metrics_accumulator.add(student_answer_result.get("metrics"))
             if student_answer_result.get("error"): raise RuntimeError(f"Baseline Student Answer failed: {student_answer_result['error']}")
             
             student_answer_text = student_answer_result.get("generated_text")
@@ -483,7 +765,7 @@ class RunnerCore:
                 question_text, student_answer_text, test_case, edge_llm_model_data
             )
             run_results["steps"]["baseline_evaluation"] = baseline_evaluation_result
-            all_metrics.append(baseline_evaluation_result.get("metrics"))
+            metrics_accumulator.add(baseline_evaluation_result.get("metrics"))
 
             # Step 4: Constraint Enforcement
             constraint_result = self._step_constraint_enforcement(student_answer_text, test_case)
@@ -500,12 +782,12 @@ class RunnerCore:
             run_results["status"] = "completed"
             
         except Exception as e:
-            self.logger.error(f"Error in Run 3 (Edge Baseline) execution: {e}", exc_info=True)
+            err_msg = self._log_failure("Error in Run 3 (Edge Baseline) execution", e)
             run_results["status"] = "failed"
-            run_results["error"] = f"Run 3 Failed: {e}"
+            run_results["error"] = f"Run 3 Failed: {err_msg}"
             
         # Aggregate metrics for entire run
-        run_results["total_metrics"] = self.metrics_collector.merge_metrics([m for m in all_metrics if m])
+        run_results["total_metrics"] = metrics_accumulator.finalize()
         
         # Add quality metrics compared to reference (Run 1)
         # Note: Detailed quality analysis is typically done by the analysis script
@@ -516,72 +798,119 @@ class RunnerCore:
         
         return run_results
 
-    def _run_edge_edgeprompt(self, test_case: Dict[str, Any], edge_llm_model_data: Dict[str, Any], validation_sequence_id: str) -> Dict[str, Any]:
+    def _run_edge_edgeprompt(self, test_case: Dict[str, Any], edge_llm_model_data: Dict[str, Any], validation_sequence_id: str,
+                             early_exit_on_validation_fail: bool = False,
+                             skip_validation_on_fatal_constraint: bool = False,
+                             fuse_question_and_answer: bool = False) -> Dict[str, Any]:
         """
         Execute Run 4 (Edge EdgePrompt):
         EdgeLLM executor with MultiTurn_EdgePrompt method.
         Similar to the previous Scenario A but using EdgeLLM.
+
+        When early_exit_on_validation_fail is set (run_parameters.run_4), a hard validation
+        failure (finalScore of 0) skips constraint enforcement.
+        When skip_validation_on_fatal_constraint is set, constraint enforcement runs first and
+        a fatal violation (e.g., prohibited content) skips multi-stage validation.
+        When fuse_question_and_answer is set, the question and the student answer come from a
+        single EdgeLLM call (one round-trip instead of two), falling back to separate calls
+        if the fused output cannot be parsed.
         """
         run_results = {"status": "started", "steps": {}}
-        all_metrics = [] # Collect metrics dict from each step
+        metrics_accumulator = self.metrics_collector.new_accumulator() # Sum metrics from each step
 
         try:
             # Step 1: Use the shared Teacher Request generated earlier
             # This ensures topic consistency across all runs
-            teacher_request_content = test_case.get("shared_teacher_request")
+            shared_teacher_request = test_case.get("shared_teacher_request")
             
             # Fall back to previous approach if shared request is not available
-            if not teacher_request_content:
-                teacher_request_content = test_case.get("teacher_request_context", {})
-                if not teacher_request_content:
-                    teacher_request_content = {
-                        "topic": test_case.get("variables", {}).get("topic", "general knowledge"),
-                        "constraints": test_case.get("constraints", {}),
-                        "evaluation_criteria": test_case.get("evaluation_criteria", {})
-                    }
+            teacher_request_content = (
+                shared_teacher_request
+                or test_case.get("teacher_request_context")
+                or {
+                    "topic": test_case.get("variables", {}).get("topic", "general knowledge"),
+                    "constraints": test_case.get("constraints", {}),
+                    "evaluation_criteria": test_case.get("evaluation_criteria", {})
+                }
+            )
+            if not shared_teacher_request:
                 self.logger.warning("Shared teacher request not found. Using fallback approach.")
                 
             run_results["steps"]["teacher_request"] = {
-                "status": "from_shared_request" if test_case.get("shared_teacher_request") else "from_test_case",
+                "status": "from_shared_request" if shared_teacher_request else "from_test_case",
                 "parsed_content": teacher_request_content
             }
 
-            # Step 2: Generate Question (EdgeLLM)
-            question_result = self._step_generate_structured_question_edge(teacher_request_content, test_case, edge_llm_model_data)
-            run_results["steps"]["generated_question"] = question_result
-            all_metrics.append(question_result.get("metrics"))
-            if question_result.get("error"): raise RuntimeError(f"Generate Question failed: {question_result['error']}")
-            question_text = question_result.get("generated_text")
-            if not question_text: raise ValueError("Generated question text is empty.")
-
-            # Step 3: Simulate Student Answer (EdgeLLM)
-            student_answer_result = self._step_simulate_student_answer_edge(question_text, teacher_request_content, test_case, edge_llm_model_data)
-            run_results["steps"]["student_answer"] = student_answer_result
-            all_metrics.append(student_answer_result.get("metrics"))
-            if student_answer_result.get("error"): raise RuntimeError(f"Student Answer failed: {student_answer_result['error']}")
-            
-            answer_text = student_answer_result.get("generated_text")
-            if not answer_text: raise ValueError("Generated answer text is empty.")
-
-            # Step 4: Perform Multi-Stage Validation with EdgeLLM
-            multi_stage_validation_result = self._step_multistage_validation_edge(
-                question_text, answer_text, teacher_request_content, edge_llm_model_data, validation_sequence_id
-            )
+            # Steps 2+3 (fused): Generate question and student answer in a single EdgeLLM call
+            fused_result = None
+            if fuse_question_and_answer:
+                fused_result = self._step_generate_question_and_answer_edge(teacher_request_content, test_case, edge_llm_model_data)
+                metrics_accumulator.add(fused_result.get("metrics"))
+                if fused_result.get("error"):
+                    self.logger.warning("Run 4: Fused question/answer generation failed (%s); falling back to separate calls.", fused_result['error'])
+                    fused_result = None
+
+            if fused_result is not None:
+                question_text = fused_result["question"]
+                answer_text = fused_result["answer"]
+                run_results["steps"]["generated_question"] = {
+                    "generated_text": question_text, "fused": True, "metrics": fused_result.get("metrics", {})
+                }
+                # Metrics for the shared call are recorded once, on the question step
+                run_results["steps"]["student_answer"] = {"generated_text": answer_text, "fused": True, "metrics": {}}
+            else:
+                # Step 2: Generate Question (EdgeLLM)
+                question_result = self._step_generate_structured_question_edge(teacher_request_content, test_case, edge_llm_model_data)
+                run_results["steps"]["generated_question"] = question_result
+                metrics_accumulator.add(question_result.get("metrics"))
+                if question_result.get("error"): raise RuntimeError(f"Generate Question failed: {question_result['error']}")
+                question_text = question_result.get("generated_text")
+                if not question_text: raise ValueError("Generated question text is empty.")
+
+                # Step 3: Simulate Student Answer (EdgeLLM)
+                student_answer_result = self._step_simulate_student_answer_edge(question_text, teacher_request_content, test_case, edge_llm_model_data)
+                run_results["steps"]["student_answer"] = student_answer_result
+                metrics_accumulator.add(student_answer_result.get("metrics"))
+                if student_answer_result.get("error"): raise RuntimeError(f"Student Answer failed: {student_answer_result['error']}")
+                
+                answer_text = student_answer_result.get("generated_text")
+                if not answer_text: raise ValueError("Generated answer text is empty.")
+
+            # Step 5 (hoisted): Constraint enforcement is local and cheap, so it can gate validation
+            constraint_result = None
+            if skip_validation_on_fatal_constraint:
+                constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
+                run_results["steps"]["constraint_enforcement"] = constraint_result
+
+            if constraint_result is not None and constraint_result.get("fatal", False):
+                self.logger.info("Run 4: Fatal constraint violation; skipping multi-stage validation.")
+                multi_stage_validation_result = self._fatal_constraint_validation_result()
+            else:
+                # Step 4: Perform Multi-Stage Validation with EdgeLLM
+                multi_stage_validation_result = self._step_multistage_validation_edge(
+                    question_text, answer_text, teacher_request_content, edge_llm_model_data, validation_sequence_id
+                )
             
             run_results["steps"]["multi_stage_validation"] = multi_stage_validation_result
-            all_metrics.append(multi_stage_validation_result.get("metrics"))
+            metrics_accumulator.add(multi_stage_validation_result.get("metrics"))
             if multi_stage_validation_result.get("error"): 
                 raise RuntimeError(f"Multi-stage Validation failed: {multi_stage_validation_result['error']}")
             
-            # Step 5: Constraint Enforcement
-            constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
-            run_results["steps"]["constraint_enforcement"] = constraint_result
+            if constraint_result is None:
+                if early_exit_on_validation_fail and self._is_hard_validation_failure(multi_stage_validation_result):
+                    # Fast path: a hard validation failure decides the run, so skip constraint enforcement
+                    self.logger.info("Run 4: Validation failed with score 0; skipping constraint enforcement.")
+                    run_results["steps"]["constraint_enforcement"] = {"executed": False, "reason": "Early exit on validation failure"}
+                else:
+                    # Step 5: Constraint Enforcement
+                    constraint_result = self._step_constraint_enforcement(answer_text, teacher_request_content)
+                    run_results["steps"]["constraint_enforcement"] = constraint_result
 
             # Store output and final decision
             run_results["output"] = answer_text
             run_results["final_decision"] = {
                 "passed_validation": multi_stage_validation_result.get("isValid", False),
-                "passed_constraints": constraint_result.get("passed", False),
+                "passed_constraints": constraint_result.get("passed", False) if constraint_result is not None else None,
                 "final_score": multi_stage_validation_result.get("finalScore", 0.0),
                 "feedback": multi_stage_validation_result.get("aggregateFeedback", "")
             }
@@ -589,12 +918,12 @@ class RunnerCore:
             run_results["status"] = "completed"
             
         except Exception as e:
-            self.logger.error(f"Error in Run 4 (Edge EdgePrompt) execution: {e}", exc_info=True)
+            err_msg = self._log_failure("Error in Run 4 (Edge EdgePrompt) execution", e)
             run_results["status"] = "failed"
-            run_results["error"] = f"Run 4 Failed: {e}"
+            run_results["error"] = f"Run 4 Failed: {err_msg}"
             
         # Aggregate metrics for entire run
-        run_results["total_metrics"] = self.metrics_collector.merge_metrics([m for m in all_metrics if m])
+        run_results["total_metrics"] = metrics_accumulator.finalize()
         
         # Add quality metrics compared to reference (Run 1)
         # Note: Detailed quality analysis is typically done by the analysis script
@@ -628,14 +957,15 @@ class RunnerCore:
                 }
             
             self.logger.debug(f"Using mock teacher request data: {teacher_req_data}")
+            teacher_req_json = json.dumps(teacher_req_data)
             return {
                 "status": "completed", 
-                "llm_output": json.dumps(teacher_req_data),
+                "llm_output": teacher_req_json,
                 "parsed_content": teacher_req_data,
                 "metrics": {
                     "latency_ms": 50,
                     "input_tokens": 0,
-                    "output_tokens": len(json.dumps(teacher_req_data).split())
+                    "output_tokens": len(teacher_req_json.split())
                 }
             }
         
@@ -657,7 +987,8 @@ class RunnerCore:
             interaction_type="generate_teacher_request",
             persona_template_id=teacher_req_template,
             context_data=teacher_req_ctx,
-            expected_output_format="json" # Expect JSON for request structure
+            expected_output_format="json", # Expect JSON for request structure
+            cacheable=True
         )
 
         # Robustly parse the teacher request JSON
@@ -684,7 +1015,7 @@ class RunnerCore:
         question_gen_template = teacher_request.get("question_template_id", "direct_constraint_template")
         # Use teacher request content directly as variables for the template
         # Merge test case context too, in case template needs it
-        question_gen_vars = {**teacher_request, **test_case.get("teacher_request_context", {})}
+        question_gen_vars = ChainMap(test_case.get("teacher_request_context", {}), teacher_request)
 
         prompt, metadata = self.template_engine.process_template(question_gen_template, question_gen_vars)
         if prompt is None:
@@ -697,7 +1028,8 @@ class RunnerCore:
             model_data=cloud_llm_model_data,
             interaction_type="generate_structured_question",
             prompt=prompt,
-            params={"temperature": 0.7}  # Allow some creativity
+            params={"temperature": 0.7},  # Allow some creativity
+            cacheable=True
         )
         self.logger.debug(f"Generated question text (first 50): {result.get('llm_output', '')[:50]}...")
         return result
@@ -729,24 +1061,23 @@ class RunnerCore:
             if isinstance(teacher_req_ctx.get("desired_constraints"), dict):
                 grade_level = teacher_req_ctx["desired_constraints"].get("safety", grade_level)
 
-        # Create a more focused prompt with explicit topic control
-        unstructured_prompt = f"""
-Generate a single, clear question about '{topic}' suitable for {grade_level}.
-The question should relate to the objective: {objective}.
-
-Your question should be direct, focused on {topic}, and appropriate for the grade level.
-Do not provide additional context or explanations - just the question itself.
-"""
+        # Create a focused prompt with explicit topic control (static instructions go in the system prompt)
+        unstructured_prompt = self._build_simple_question_prompt(topic, grade_level, objective)
 
         result = self._execute_cloud_llm_interaction(
             model_data=cloud_llm_model_data,
             interaction_type="generate_simple_question",
             prompt=unstructured_prompt,
-            params={"temperature": 0.7}
+            params={"temperature": 0.7, "system_prompt": SIMPLE_QUESTION_SYSTEM_PROMPT}
         )
         self.logger.debug(f"Generated topic-controlled question (first 50): {result.get('llm_output', '')[:50]}...")
         return result
 
+    @staticmethod
+    def _build_simple_question_prompt(topic: str, grade_level: str, objective: str) -> str:
+        """Builds the variable part of the simple question prompt (see SIMPLE_QUESTION_SYSTEM_PROMPT)."""
+        return f"Topic: {topic}\nGrade level: {grade_level}\nObjective: {objective}"
+
     def _step_simulate_student_answer(self, question_text: Optional[str], teacher_request: Optional[Dict[str, Any]], test_case: Dict[str, Any], cloud_llm_model_data: Dict[str, Any]) -> Dict[str, Any]:
         """Step: Simulate Student Answer (CloudLLM)."""
         self.logger.debug("Simulating Student Answer using CloudLLM...")
@@ -766,11 +1097,28 @@ Do not provide additional context or explanations - just the question itself.
             model_data=cloud_llm_model_data,
             interaction_type="generate_student_answer",
             persona_template_id=student_answer_template,
-            context_data=student_context
+            context_data=student_context,
+            cacheable=True
         )
         self.logger.debug(f"Simulated student answer (first 50): {result.get('llm_output', '')[:50]}...")
         return result
 
+    def _get_criteria_str(self, test_case: Dict[str, Any]) -> str:
+        """
+        Returns the test case's evaluation criteria as indented JSON.
+        The criteria do not change during a suite, so the string is cached per test case ID
+        (the test case itself is logged with every result and must not be modified).
+        """
+        test_case_id = test_case.get("id")
+        if test_case_id is None:
+            return json.dumps(test_case.get("evaluation_criteria", {}), indent=2)
+        with self._criteria_str_cache_lock:
+            criteria_str = self._criteria_str_cache.get(test_case_id)
+            if criteria_str is None:
+                criteria_str = json.dumps(test_case.get("evaluation_criteria", {}), indent=2)
+                self._criteria_str_cache[test_case_id] = criteria_str
+        return criteria_str
+
     def _step_baseline_evaluation(self, question: Optional[str], answer: Optional[str], test_case: Dict[str, Any], cloud_llm_model_data: Dict[str, Any]) -> Dict[str, Any]:
         """Step: Simple Baseline Evaluation (CloudLLM)."""
         self.logger.debug("Performing Baseline Evaluation using CloudLLM...")
@@ -780,9 +1128,8 @@ Do not provide additional context or explanations - just the question itself.
             step_result["error"] = "Missing question or answer for evaluation."
             return step_result
 
-        # Get evaluation criteria from the test case
-        eval_criteria = test_case.get("evaluation_criteria", {})
-        criteria_str = json.dumps(eval_criteria, indent=2)
+        # Get evaluation criteria from the test case (serialized once per test case)
+        criteria_str = self._get_criteria_str(test_case)
 
         context_data = {
             "question_text": question,
@@ -841,14 +1188,7 @@ Provide a JSON response with these fields:
             self.logger.debug(f"Starting multi-stage validation with sequence '{validation_sequence_id}'")
             
             # Use the EvaluationEngine to handle the validation
-            def cloud_llm_executor_wrapper(prompt: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-                # This inner function calls the actual ModelManager method
-                return self._execute_cloud_llm_interaction(
-                    cloud_llm_model_data, 
-                    "validation", 
-                    prompt=prompt, 
-                    params=params
-                )
+            cloud_llm_executor_wrapper = functools.partial(self._execute_cloud_llm_validation, cloud_llm_model_data)
             
             # Execute the validation through the evaluation engine
             validation_result = self.evaluation_engine.validate_with_sequence(
@@ -862,8 +1202,8 @@ Provide a JSON response with these fields:
             return validation_result
         
         except Exception as e:
-            self.logger.error(f"Multi-stage validation error: {e}", exc_info=True)
-            return {"error": f"Validation failed: {str(e)}", "isValid": False}
+            err_msg = self._log_failure("Multi-stage validation error", e)
+            return {"error": f"Validation failed: {err_msg}", "isValid": False}
 
     def _step_constraint_enforcement(self, student_answer: Optional[str], context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Step: Constraint Enforcement."""
@@ -953,17 +1293,12 @@ Provide a JSON response with these fields:
             if isinstance(teacher_req_ctx.get("desired_constraints"), dict):
                 grade_level = teacher_req_ctx["desired_constraints"].get("safety", grade_level)
 
-        # Create a more focused prompt with explicit topic control
-        unstructured_prompt = f"""
-Generate a single, clear question about '{topic}' suitable for {grade_level}.
-The question should relate to the objective: {objective}.
-
-Your question should be direct, focused on {topic}, and appropriate for the grade level.
-Do not provide additional context or explanations - just the question itself.
-"""
+        # Create a focused prompt with explicit topic control (static instructions go in the system prompt)
+        unstructured_prompt = self._build_simple_question_prompt(topic, grade_level, objective)
 
         result = self._execute_edge_llm(
-             edge_llm_model_data, unstructured_prompt, params={"temperature": 0.7}
+             edge_llm_model_data, unstructured_prompt,
+             params={"temperature": 0.7, "system_prompt": SIMPLE_QUESTION_SYSTEM_PROMPT}
         )
         self.logger.debug(f"Generated topic-controlled question (first 50): {result.get('generated_text', '')[:50]}...")
         return result
@@ -978,7 +1313,7 @@ Do not provide additional context or explanations - just the question itself.
         question_gen_template = teacher_request.get("question_template_id", "direct_constraint_template")
         # Use teacher request content directly as variables for the template
         # Merge test case context too, in case template needs it
-        question_gen_vars = {**teacher_request, **test_case.get("teacher_request_context", {})}
+        question_gen_vars = ChainMap(test_case.get("teacher_request_context", {}), teacher_request)
 
         prompt, metadata = self.template_engine.process_template(question_gen_template, question_gen_vars)
         if prompt is None:
@@ -988,11 +1323,61 @@ Do not provide additional context or explanations - just the question itself.
 
         # Execute EdgeLLM call
         result = self._execute_edge_llm(
-             edge_llm_model_data, prompt, params={"temperature": 0.7} # Allow some creativity
+             edge_llm_model_data, prompt, params={"temperature": 0.7}, # Allow some creativity
+             cacheable=True
         )
         self.logger.debug(f"Generated question text (first 50): {result.get('generated_text', '')[:50]}...")
         return result
 
+    def _step_generate_question_and_answer_edge(self, teacher_request: Optional[Dict[str, Any]], test_case: Dict[str, Any], edge_llm_model_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Step: Generate Structured Question and Simulated Student Answer in one call (EdgeLLM)."""
+        self.logger.debug("Generating Question and Student Answer in a single EdgeLLM call...")
+        if not teacher_request:
+            return {"error": "Cannot generate question: Teacher request data is missing.", "metrics": {}}
+
+        question_gen_template = teacher_request.get("question_template_id", "direct_constraint_template")
+        question_gen_vars = ChainMap(test_case.get("teacher_request_context", {}), teacher_request)
+
+        question_prompt, metadata = self.template_engine.process_template(question_gen_template, question_gen_vars)
+        if question_prompt is None:
+            error_msg = f"Failed to process question generation template '{question_gen_template}': {metadata.get('error', 'Unknown')}"
+            self.logger.error(error_msg)
+            return {"error": error_msg, "metrics": {}}
+
+        constraints = teacher_request.get("constraints", {})
+        word_count_target = (constraints.get("maxWords", 100) if isinstance(constraints, dict) else 100) // 2
+
+        fused_prompt = f"""{question_prompt}
+
+After writing the question, answer it as the student described below, in approximately {word_count_target} words.
+
+Student profile: {test_case.get("student_persona_profile", "Average student.")}
+
+Return ONLY a JSON object with these fields:
+{{
+  "question": "The question you generated",
+  "answer": "The student's answer to that question"
+}}"""
+
+        result = self._execute_edge_llm(
+             edge_llm_model_data, fused_prompt, params={"temperature": 0.7, "json_output": True}
+        )
+        if result.get("error"):
+            return result
+
+        parsed = self._parse_json_from_llm_output(result.get("generated_text"))
+        question_text = parsed.get("question") if isinstance(parsed, dict) else None
+        answer_text = parsed.get("answer") if isinstance(parsed, dict) else None
+        if not isinstance(question_text, str) or not question_text.strip() \
+                or not isinstance(answer_text, str) or not answer_text.strip():
+            result["error"] = "Fused output did not contain a non-empty question and answer."
+            return result
+
+        result["question"] = question_text.strip()
+        result["answer"] = answer_text.strip()
+        self.logger.debug(f"Fused question (first 50): {result['question'][:50]}...")
+        return result
+
     def _step_simulate_student_answer_edge(self, question_text: Optional[str], context: Optional[Dict[str, Any]], test_case: Dict[str, Any], edge_llm_model_data: Dict[str, Any]) -> Dict[str, Any]:
         """Step: Simulate Student Answer (EdgeLLM)."""
         self.logger.debug("Simulating Student Answer using EdgeLLM...")
@@ -1003,8 +1388,8 @@ Do not provide additional context or explanations - just the question itself.
         # Create simple prompt for student answer
         word_count_target = context.get("constraints", {}).get("maxWords", 100) // 2
         
-        student_prompt = f"""Answer the following question as if you were a student. 
-Write approximately {word_count_target} words.
+        # Static instructions go in the system prompt; the user prompt carries only the variable part
+        student_prompt = f"""Write approximately {word_count_target} words.
 
 Student profile: {test_case.get("student_persona_profile", "Average student.")}
 
@@ -1013,7 +1398,9 @@ Question: {question_text}
 Your answer:"""
 
         result = self._execute_edge_llm(
-            edge_llm_model_data, student_prompt, params={"temperature": 0.7}
+            edge_llm_model_data, student_prompt,
+            params={"temperature": 0.7, "system_prompt": STUDENT_ANSWER_SYSTEM_PROMPT},
+            cacheable=True
         )
         self.logger.debug(f"Simulated student answer (first 50): {result.get('generated_text', '')[:50]}...")
         return result
@@ -1027,9 +1414,8 @@ Your answer:"""
             step_result["error"] = "Missing question or answer for evaluation."
             return step_result
 
-        # Get evaluation criteria from the test case
-        eval_criteria = test_case.get("evaluation_criteria", {})
-        criteria_str = json.dumps(eval_criteria, indent=2)
+        # Get evaluation criteria from the test case (serialized once per test case)
+        criteria_str = self._get_criteria_str(test_case)
 
         eval_prompt = f"""Evaluate this student answer:
 Question: {question}
@@ -1081,9 +1467,9 @@ Provide a JSON response with these fields:
             self.logger.debug(f"Starting multi-stage validation with sequence '{validation_sequence_id}'")
             
             # Use the EvaluationEngine to handle the validation
-            def edge_llm_executor_wrapper(prompt: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-                # This inner function calls the actual ModelManager method
-                return self._execute_edge_llm(edge_llm_model_data, prompt, params)
+            edge_llm_executor_wrapper = functools.partial(self._execute_edge_llm, edge_llm_model_data)
+            # Used for sequences with "parallelStages" so all stage prompts go out as one batch
+            edge_llm_batch_executor = functools.partial(self._execute_edge_llm_batch, edge_llm_model_data)
             
             # Execute the validation through the evaluation engine
             try:
@@ -1092,7 +1478,8 @@ Provide a JSON response with these fields:
                     answer=answer,
                     context=teacher_request,  # Contains constraints and rubric
                     validation_sequence_id=validation_sequence_id,
-                    llm_executor=edge_llm_executor_wrapper
+                    llm_executor=edge_llm_executor_wrapper,
+                    batch_executor=edge_llm_batch_executor
                 )
                 return validation_result
             except ValueError as ve:
@@ -1100,9 +1487,6 @@ Provide a JSON response with these fields:
                 if "VALIDATION ERROR" in str(ve) and any(msg in str(ve) for msg in ["JSON", "parse"]):
                     self.logger.warning(f"JSON parsing error detected: {ve}")
                     
-                    # Import our new JSON utilities
-                    from .json_utils import parse_llm_json_output
-                    
                     # First try the simplified validation sequence
                     simple_validation_id = "simplified_validation_sequence"
                     
@@ -1116,7 +1500,8 @@ Provide a JSON response with these fields:
                                 answer=answer,
                                 context=teacher_request,
                                 validation_sequence_id=simple_validation_id,
-                                llm_executor=edge_llm_executor_wrapper
+                                llm_executor=edge_llm_executor_wrapper,
+                                batch_executor=edge_llm_batch_executor
                             )
                             return validation_result
                         except Exception as e2:
@@ -1127,27 +1512,22 @@ Provide a JSON response with these fields:
                     # Use a direct JSON generation approach
                     self.logger.info("Generating direct validation JSON...")
                     
-                    # Construct a simple validation prompt that focuses just on generating valid JSON
-                    json_focus_prompt = f"""Evaluate this student answer to a question. Return ONLY valid JSON without markdown.
-
-QUESTION: {question}
+                    # Construct a simple validation prompt that focuses just on generating valid JSON;
+                    # the fixed instructions go in the system prompt so repeated calls share a cached prefix
+                    json_focus_prompt = f"""QUESTION: {question}
 
-STUDENT ANSWER: {answer}
-
-Evaluate if the answer is relevant to the question and the information is accurate.
-Output MUST be valid JSON with this exact structure: {{"passed": true/false, "score": 0.7, "feedback": "Your feedback here"}}
-
-The "passed" field must be true or false.
-The "score" field must be a number between 0 and 1.
-The "feedback" field must be a string with your evaluation.
+STUDENT ANSWER: {answer}"""
 
-IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or explanations."""
-
-                    # Execute with parameters forcing JSON output and low temperature
+                    # Execute with parameters forcing JSON output and greedy decoding: the fallback only
+                    # needs well-formed JSON, and a deterministic result is reproducible and cacheable
                     json_params = {
-                        "temperature": 0.1,
+                        "temperature": 0.0,
+                        "top_k": 1,
+                        "top_p": 1.0,
+                        "seed": 0,
                         "max_tokens": 256,
-                        "json_output": True
+                        "json_output": True,
+                        "system_prompt": DIRECT_VALIDATION_SYSTEM_PROMPT
                     }
                     
                     result = edge_llm_executor_wrapper(json_focus_prompt, json_params)
@@ -1172,7 +1552,7 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
                                     )
                                     try:
                                         # Try to parse the repaired JSON
-                                        parsed_json = json.loads(repaired_json_str)
+                                        parsed_json = json_loads(repaired_json_str)
                                         return {
                                             "isValid": parsed_json.get("passed", False),
                                             "finalScore": float(parsed_json.get("score", 0.0)),
@@ -1185,12 +1565,12 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
                                             "aggregateFeedback": parsed_json.get("feedback", "Repaired validation result."),
                                             "metrics": {"json_repaired": True}
                                         }
-                                    except json.JSONDecodeError:
-                                        # Give up and raise the original exception
-                                        raise ve
+                                    except json.JSONDecodeError as repair_error:
+                                        # Give up; the original exception is re-raised unchanged below
+                                        self.logger.warning("JSON repair output is not valid JSON either: %s", repair_error)
                         
-                        # If we get here, all approaches failed
-                        raise ve
+                        # If we get here, all approaches failed; re-raise the active exception as is
+                        raise
                         
                     # Try to parse the direct JSON result using our utility
                     generated_text = result.get("generated_text", "")
@@ -1222,8 +1602,8 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
                     raise
             
         except Exception as e:
-            self.logger.error(f"Multi-stage validation error: {e}", exc_info=True)
-            return {"error": f"Validation failed: {str(e)}", "isValid": False}
+            err_msg = self._log_failure("Multi-stage validation error", e)
+            return {"error": f"Validation failed: {err_msg}", "isValid": False}
 
 
     # --- Core LLM Execution Helpers ---
@@ -1232,13 +1612,15 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
                                      persona_template_id: Optional[str] = None, context_data: Optional[Dict[str, Any]] = None,
                                      prompt: Optional[str] = None,
                                      params: Optional[Dict[str, Any]] = None,
-                                     expected_output_format: Optional[str] = None) -> Dict[str, Any]:
+                                     expected_output_format: Optional[str] = None,
+                                     cacheable: bool = False) -> Dict[str, Any]:
         """
         Helper to execute an interaction with CloudLLM.
         Handles template processing and calls ModelManager.
+        If cacheable and response caching is enabled, identical calls reuse a stored completion.
         Returns full result dict.
         """
-        self.logger.debug(f"Executing CloudLLM Interaction: {interaction_type}")
+        self.logger.debug("Executing CloudLLM Interaction: %s", interaction_type)
 
         # Process template if provided
         if persona_template_id and context_data:
@@ -1257,101 +1639,236 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
             return {"error": error_msg, "llm_output": None, "metrics": {}}
 
         # Set up parameters
-        execution_params = params or {"temperature": 0.7} # Default temp
+        # Copy so the per-interaction overrides below never leak into the caller's (or the default) dict
+        execution_params = dict(params or DEFAULT_CLOUD_LLM_PARAMS)
         if interaction_type == "review_evaluation": execution_params["temperature"] = 0.2 # More objective review
         if expected_output_format == "json":
             execution_params["response_format"] = {"type": "json_object"}
+        execution_params = self._apply_pipeline_system_prompt(execution_params)
+
+        cacheable = cacheable or self._is_deterministic_call(execution_params)
+        cache_key = self._response_cache_key(model_data, prompt, execution_params) if cacheable else None
+        cached_result = self._get_cached_response(cache_key)
+        if cached_result is not None:
+            cached_result["interaction_type"] = interaction_type
+            return cached_result
 
         result = self.model_manager.execute_cloud_llm(model_data, prompt, execution_params)
+        self._store_cached_response(cache_key, result)
         # Result structure: {llm_output, input_tokens, output_tokens, metrics, error?}
         result["interaction_type"] = interaction_type # Add interaction type for context
-        self.logger.debug(f"CloudLLM Interaction '{interaction_type}' complete. Error: {result.get('error')}")
+        self.logger.debug("CloudLLM Interaction '%s' complete. Error: %s", interaction_type, result.get('error'))
         return result
 
     def _execute_edge_llm(self, model_data: Dict[str, Any], prompt: str,
-                       params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                       params: Optional[Dict[str, Any]] = None,
+                       cacheable: bool = False) -> Dict[str, Any]:
         """
         Helper to execute a task with EdgeLLM via ModelManager.
+        If cacheable and response caching is enabled, identical calls reuse a stored completion.
         Returns full result dict.
         """
-        self.logger.debug(f"Executing EdgeLLM task (prompt len {len(prompt)})... Params: {params}")
+        self.logger.debug("Executing EdgeLLM task (prompt len %d)... Params: %s", len(prompt), params)
         if not prompt:
              self.logger.error("EdgeLLM execution requested with empty prompt.")
              return {"error": "Empty prompt provided to EdgeLLM.", "generated_text": None, "metrics": {}}
+        params = self._apply_pipeline_system_prompt(params)
+        cacheable = cacheable or self._is_deterministic_call(params)
+        cache_key = self._response_cache_key(model_data, prompt, params) if cacheable else None
+        cached_result = self._get_cached_response(cache_key)
+        if cached_result is not None:
+            return cached_result
+
         result = self.model_manager.execute_edge_llm(model_data, prompt, params)
+        self._store_cached_response(cache_key, result)
         # Result structure: {generated_text, input_tokens, output_tokens, metrics, error?}
-        self.logger.debug(f"EdgeLLM task complete. Error: {result.get('error')}")
+        self.logger.debug("EdgeLLM task complete. Error: %s", result.get('error'))
         return result
 
 
+    def _execute_cloud_llm_validation(self, model_data: Dict[str, Any], prompt: str,
+                                      params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Executes a validation-stage prompt with CloudLLM (llm_executor callback for the EvaluationEngine)."""
+        return self._execute_cloud_llm_interaction(model_data, "validation", prompt=prompt, params=params)
+
+    def _execute_edge_llm_batch(self, model_data: Dict[str, Any], prompts: List[str],
+                                params: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Executes several independent prompts with EdgeLLM as one batch (batch_executor callback).
+        Like _execute_edge_llm, deterministic calls reuse stored completions when response caching
+        is enabled; only the prompts without one are sent in the batch.
+        """
+        params = self._apply_pipeline_system_prompt(params)
+        if self._is_deterministic_call(params):
+            cache_keys = [self._response_cache_key(model_data, prompt, params) for prompt in prompts]
+        else:
+            cache_keys = [None] * len(prompts)
+        results = [self._get_cached_response(cache_key) for cache_key in cache_keys]
+        
+        uncached_indices = [index for index, result in enumerate(results) if result is None]
+        if uncached_indices:
+            batch_results = self.model_manager.execute_edge_llm_batch(
+                model_data, [prompts[index] for index in uncached_indices], params
+            )
+            for index, result in zip(uncached_indices, batch_results):
+                self._store_cached_response(cache_keys[index], result)
+                results[index] = result
+        return results
+
+    def _apply_pipeline_system_prompt(self, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Returns params with PIPELINE_SYSTEM_PROMPT leading the system prompt when
+        shared_system_prompt is enabled; any step-specific system prompt follows it.
+        The caller's dict is not modified.
+        """
+        if not self.shared_system_prompt:
+            return params
+        params = dict(params or {})
+        step_system_prompt = params.get("system_prompt")
+        params["system_prompt"] = (f"{PIPELINE_SYSTEM_PROMPT}\n\n{step_system_prompt}"
+                                   if step_system_prompt else PIPELINE_SYSTEM_PROMPT)
+        return params
+
+    def _is_deterministic_call(self, params: Optional[Dict[str, Any]]) -> bool:
+        """Returns True if the call's temperature is low enough for its completion to be reused."""
+        temperature = (params or {}).get("temperature")
+        return temperature is not None and temperature <= self.DETERMINISTIC_TEMPERATURE_MAX
+
+    def _response_cache_key(self, model_data: Dict[str, Any], prompt: str,
+                            params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Returns the completion cache key for a call, or None when response caching is disabled."""
+        if not self.cache_llm_responses:
+            return None
+        key_data = json_dumps(
+            {"model": model_data.get("model_id"), "mock": model_data.get("mock", False),
+             "prompt": prompt, "params": params or {}},
+            sort_keys=True
+        )
+        return hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a stored completion. A hit is returned as a copy flagged "cached", with zeroed
+        metrics (like the shared teacher request) so reused calls do not inflate latency/token totals.
+        """
+        if cache_key is None:
+            return None
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+            self._response_cache_stats["misses" if cached is None else "hits"] += 1
+        if cached is None:
+            return None
+        self.logger.debug("Using cached LLM response %s", cache_key[:12])
+        result = copy.deepcopy(cached)
+        result["cached"] = True
+        result["metrics"] = {"latency_ms": 0, "input_tokens": 0, "output_tokens": 0,
+                             "total_tokens": 0, "tokens_per_second": 0.0}
+        return result
+
+    def _store_cached_response(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        """Stores a successful completion under cache_key (no-op when caching is off or the call failed)."""
+        if cache_key is None or result.get("error"):
+            return
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = copy.deepcopy(result)
+
     # --- Other Helper Methods ---
 
     def _parse_json_from_llm_output(self, text: Optional[str]) -> Optional[Dict[str, Any]]:
         """
         Robustly attempts to parse JSON from LLM text output using various patterns.
         Returns dictionary on success, None on failure. Logs warnings on failure.
+        Parses are memoized per text (see _parse_json_text); each caller gets its own copy.
         """
         if not text or not isinstance(text, str):
             self.logger.warning("Attempted to parse JSON from empty or non-string input.")
             return None
 
-        # Clean potential wrapping quotes if the whole string is quoted JSON
-        if text.startswith('"') and text.endswith('"'):
-             text = text[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        parsed_data = self._parse_json_text(text)
+        if parsed_data is None:
+            self.logger.warning(f"Failed to find/parse valid JSON in text: {text.strip()[:150]}...")
+            return None
+        # Callers store and annotate the parsed result, so never hand out the cached object
+        return copy.deepcopy(parsed_data)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=JSON_PARSE_CACHE_SIZE)
+    def _parse_json_text(text: str) -> Optional[Any]:
+        """
+        Uncached parsing logic behind _parse_json_from_llm_output (expects a non-empty string).
+        Static so the LRU cache is shared across instances and does not hold on to them.
+        """
+        logger = logging.getLogger("edgeprompt.runner.core")
+
+        # Clean potential wrapping quotes if the whole string is quoted JSON; only outputs whose
+        # quoted content is JSON-shaped qualify, and a valid string literal is unescaped in one pass
+        if text.startswith(('"{', '"[')) and text.endswith('"'):
+            try:
+                unquoted = json_loads(text)
+            except json.JSONDecodeError:
+                unquoted = None
+            text = unquoted if isinstance(unquoted, str) else text[1:-1].replace('\\"', '"').replace('\\\\', '\\')
 
         # Strip leading/trailing whitespace
         text = text.strip()
 
-        self.logger.debug(f"Attempting to parse JSON from output (first 150): {text[:150]}...")
+        logger.debug("Attempting to parse JSON from output (first 150): %.150s...", text)
 
         # 1. Try direct parsing (most common case for compliant models)
         try:
-            return json.loads(text)
+            return json_loads(text)
         except json.JSONDecodeError:
-            self.logger.debug("Direct JSON parsing failed. Trying extraction patterns.")
+            logger.debug("Direct JSON parsing failed. Trying extraction patterns.")
             pass # Continue to extraction patterns
 
-        # 2. Try extracting from markdown code blocks (```json ... ``` or ``` ... ```)
-        patterns = [
-            r'```(?:json)?\s*(\{.*?\})\s*```', # ```json { ... } ``` or ``` { ... } ``` (non-greedy)
-            r'```\s*(\[.*?\])\s*```'          # ``` [ ... ] ``` (for arrays)
-        ]
-        for pattern in patterns:
-             match = re.search(pattern, text, re.DOTALL)
-             if match:
-                 json_text = match.group(1)
-                 try:
-                     self.logger.debug(f"Found JSON in markdown block: {json_text[:100]}...")
-                     return json.loads(json_text)
-                 except json.JSONDecodeError:
-                     self.logger.warning(f"Extracted text from markdown looked like JSON but failed to parse: {json_text[:100]}...")
-                     # Continue searching, maybe there's another block or direct JSON later
-
-        # 3. Permissive: Find first top-level JSON object or array starting at the beginning
-        #    Handles cases where the LLM just outputs JSON without markdown
-        json_match_obj = re.match(r'^\s*(\{.*?\})\s*$', text, re.DOTALL)
-        json_match_arr = re.match(r'^\s*(\[.*?\])\s*$', text, re.DOTALL)
-        if json_match_obj:
-            json_text = json_match_obj.group(1)
-        elif json_match_arr:
-            json_text = json_match_arr.group(1)
-        else:
-             json_text = None
-
-        if json_text:
+        # 2. Scan for the first balanced JSON object/array (inside markdown blocks or surrounding
+        #    text alike) in one linear pass; brackets inside JSON strings are ignored
+        for start, end in find_json_spans(text):
+            json_text = text[start:end]
             try:
-                 self.logger.debug(f"Found JSON object/array via start/end match: {json_text[:100]}...")
-                 # Final check: ensure it's a dict or list after parsing
-                 parsed_data = json.loads(json_text)
-                 if isinstance(parsed_data, (dict, list)):
-                     return parsed_data
-                 else:
-                      self.logger.warning(f"Permissive search found JSON-like text but result was not dict/list: {type(parsed_data)}")
+                parsed_data = json_loads(json_text)
             except json.JSONDecodeError:
-                 self.logger.warning(f"Permissive search found JSON-like text but failed parse: {json_text[:100]}...")
+                logger.debug("Balanced JSON-like span failed to parse: %.100s...", json_text)
+                continue
+            if isinstance(parsed_data, (dict, list)):
+                logger.debug("Found JSON object/array via bracket scan: %.100s...", json_text)
+                return parsed_data
+
+        return None # Failed to parse (logged by _parse_json_from_llm_output)
 
-        self.logger.warning(f"Failed to find/parse valid JSON in text: {text[:150]}...")
-        return None # Failed to parse
+    def close(self) -> None:
+        """
+        Release resources held across test suites (result writer thread, pooled HTTP connections).
+        The RunnerCore should not be used after calling this.
+        """
+        self._wait_for_result_logs()
+        self._log_executor.shutdown(wait=True)
+        self.result_logger.close()
+        self.model_manager.close()
+        if self._response_cache_persistent:
+            with self._response_cache_lock:
+                self._response_cache.close()
+
+    def __enter__(self) -> "RunnerCore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _submit_result_log(self, run_data: Dict[str, Any]) -> None:
+        """Queues a run result for writing on the background result-writer thread."""
+        self._log_pending.append(self._log_executor.submit(self.result_logger.log_result, run_data))
+
+    def _wait_for_result_logs(self) -> None:
+        """Blocks until all queued result writes finish, logging any that failed."""
+        if not self._log_pending:
+            return
+        concurrent.futures.wait(self._log_pending)
+        for future in self._log_pending:
+            error = future.exception()
+            if error:
+                self.logger.error(f"Failed to write run result: {error}")
+        self._log_pending = []
 
     def _create_run_data_struct(self, run_id: str, test_case_id: str, cloud_llm_id: str, edge_llm_id: str, hw_profile: str) -> Dict[str, Any]:
         """Creates the initial dictionary structure for a single test run results."""
@@ -1368,69 +1885,147 @@ IMPORTANT: Return ONLY the JSON object - NO markdown formatting, code blocks, or
             "run_4": {"status": "pending"}
         }
 
-    def _create_analysis_summary(self, suite_id: str, run_count: int, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _summarize_run_status(self, run_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduces a run result to the status/score/latency fields recorded in the RunStatusTable."""
+        status_record = {"id": run_data.get("id"), "error": run_data.get("error")}
+        for run_key in RUN_KEYS:
+            run_results = run_data.get(run_key, {})
+            status_record[run_key] = {
+                "status": run_results.get("status", "pending"),
+                "error": run_results.get("error"),
+                "final_score": (run_results.get("final_decision") or {}).get("final_score"),
+                "latency_ms": (run_results.get("total_metrics") or {}).get("latency_ms")
+            }
+        return status_record
+
+    def _describe_columns(self, columns: Sequence[Sequence[float]], column_names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Computes count/mean/std/total per column, ignoring NaN entries.
+
+        Args:
+            columns: One column per run type, one value per run (NaN where the value is missing).
+            column_names: Names for the columns in the returned dict.
+
+        Returns:
+            Dict mapping each column name to its statistics (mean/std are None when count is 0).
+        """
+        if not columns or not len(columns[0]):
+            counts = [0] * len(column_names)
+            totals = means = stds = [0.0] * len(column_names)
+        elif np is not None:
+            values = np.asarray(columns, dtype=np.float64)
+            present = ~np.isnan(values)
+            filled = np.where(present, values, 0.0)
+            counts = present.sum(axis=1)
+            totals = filled.sum(axis=1)
+            means = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+            squared_dev = np.where(present, (values - means[:, None]) ** 2, 0.0).sum(axis=1)
+            stds = np.sqrt(np.divide(squared_dev, counts, out=np.zeros_like(totals), where=counts > 0))
+        else:
+            present_columns = [[v for v in column if not math.isnan(v)] for column in columns]
+            counts = [len(column) for column in present_columns]
+            totals = [math.fsum(column) for column in present_columns]
+            means = [statistics.fmean(column) if column else 0.0 for column in present_columns]
+            stds = [statistics.pstdev(column) if column else 0.0 for column in present_columns]
+
+        return {
+            name: {
+                "count": int(counts[i]),
+                "mean": round(float(means[i]), 4) if counts[i] else None,
+                "std": round(float(stds[i]), 4) if counts[i] else None,
+                "total": round(float(totals[i]), 4)
+            }
+            for i, name in enumerate(column_names)
+        }
+
+    def _create_analysis_summary(self, suite_id: str, run_count: int, results: RunStatusTable) -> Dict[str, Any]:
         """Creates a basic analysis summary dictionary (more detailed analysis in scripts)."""
+        # Status buckets and error counts were tallied as records were added; score and
+        # latency statistics are computed column-wise (completed runs only report values)
+        score_stats = self._describe_columns([results.final_scores[run_key] for run_key in RUN_KEYS], RUN_KEYS)
+        latency_stats = self._describe_columns([results.latencies_ms[run_key] for run_key in RUN_KEYS], RUN_KEYS)
+        errors = results.error_count
         summary = {
             "test_suite_id": suite_id,
             "total_runs_attempted": run_count,
             "total_runs_logged": len(results),
-            "runs_with_errors": 0,
-            "runs_by_status": {
-                "run_1": {"completed": 0, "failed": 0, "pending": 0},
-                "run_2": {"completed": 0, "failed": 0, "pending": 0},
-                "run_3": {"completed": 0, "failed": 0, "pending": 0},
-                "run_4": {"completed": 0, "failed": 0, "pending": 0}
+            "runs_with_errors": errors,
+            "runs_by_status": {run_key: dict(results.status_counts[run_key]) for run_key in RUN_KEYS},
+            "run_metrics": {
+                run_key: {"final_score": score_stats[run_key], "latency_ms": latency_stats[run_key]}
+                for run_key in RUN_KEYS
             }
         }
-        
-        errors = 0
-        for res in results:
-            # Count top-level errors
-            if res.get("error"):
-                errors += 1
-            
-            # Count run-specific statuses
-            for run_key in ["run_1", "run_2", "run_3", "run_4"]:
-                run_data = res.get(run_key, {})
-                status = run_data.get("status", "pending")
-                
-                if status == "completed":
-                    summary["runs_by_status"][run_key]["completed"] += 1
-                elif status == "failed" or run_data.get("error"):
-                    summary["runs_by_status"][run_key]["failed"] += 1
-                    errors += 1
-                else:
-                    summary["runs_by_status"][run_key]["pending"] += 1
-        
-        summary["runs_with_errors"] = errors
+        if self.cache_llm_responses:
+            with self._response_cache_lock:
+                summary["llm_response_cache"] = dict(self._response_cache_stats)
+
         self.logger.info(f"Analysis Summary: Attempted={run_count}, Logged={len(results)}, Errors={errors}")
         
         return summary 
 
+    def _fatal_constraint_validation_result(self) -> Dict[str, Any]:
+        """Returns the placeholder validation result used when a fatal constraint violation skips validation."""
+        return {
+            "isValid": False,
+            "finalScore": 0.0,
+            "aggregateFeedback": "Skipped: fatal constraint violation",
+            "stageResults": [],
+            "metrics": {}
+        }
+
+    def _is_hard_validation_failure(self, validation_result: Dict[str, Any]) -> bool:
+        """Returns True if multi-stage validation failed outright (invalid with a final score of 0)."""
+        return (not validation_result.get("isValid", True)
+                and validation_result.get("finalScore", 1.0) == 0.0)
+
     def _verify_topic_consistency(self, run_data: Dict[str, Any], test_case: Dict[str, Any]) -> None:
         """
-        Verify topic consistency across all runs and log the results.
-        This helps identify when runs are not following the same topic.
+        Verify topic consistency across all runs.
+        Logs question previews and a single line listing runs whose generated question does
+        not mention the expected topic, all at DEBUG level: the keyword check is only a rough
+        heuristic (mock questions never mention the topic), so it must not add warnings.
         """
-        self.logger.info("-- Topic Consistency Verification --")
-        
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         # Get the expected topic
         expected_topic = test_case.get("shared_teacher_request", {}).get("topic", 
                            test_case.get("variables", {}).get("topic", "unknown"))
-        
-        self.logger.info(f"Expected topic: {expected_topic}")
-        
-        # Extract the first 100 chars of generated questions for inspection
-        for run_num in range(1, 5):
-            run_key = f"run_{run_num}"
-            if run_key in run_data:
-                question_data = run_data[run_key].get("steps", {}).get("generated_question", {})
-                question_text = question_data.get("llm_output", question_data.get("generated_text", ""))
-                if question_text:
-                    preview = question_text[:100].replace("\n", " ")
-                    self.logger.info(f"{run_key} question preview: \"{preview}...\"")
-        
-        self.logger.info("-- End Verification --")
+        topic_keywords = [word for word in TOPIC_WORD_PATTERN.findall(str(expected_topic).lower()) if len(word) > 3]
+
+        off_topic_runs = []
+        for run_key in RUN_KEYS:
+            question_data = run_data.get(run_key, {}).get("steps", {}).get("generated_question", {})
+            question_text = question_data.get("llm_output") or question_data.get("generated_text")
+            if not question_text:
+                continue
+            self.logger.debug("%s question preview: \"%s...\"", run_key, question_text[:100].replace("\n", " "))
+            lowered = question_text.lower()
+            if topic_keywords and not any(word in lowered for word in topic_keywords):
+                off_topic_runs.append(run_key)
+
+        if off_topic_runs:
+            self.logger.debug("Topic drift in %s: expected topic %r not mentioned by %s",
+                              run_data.get("id"), expected_topic, ", ".join(off_topic_runs))
+        else:
+            self.logger.debug("Topic consistency OK for %s", run_data.get("id"))
+
+    def _log_failure(self, message: str, exception: Exception) -> str:
+        """
+        Logs a recoverable failure at ERROR level, with the traceback only at DEBUG level.
+
+        Args:
+            message: Description of the failed operation.
+            exception: The exception being handled.
+
+        Returns:
+            The exception formatted once as "<ExceptionType>: <message>", for storing in results.
+        """
+        err_msg = f"{type(exception).__name__}: {exception}"
+        self.logger.error("%s: %s", message, err_msg)
+        self.logger.debug("Traceback for failure: %s", message, exc_info=True)
+        return err_msg
 
     def _log_and_return_error(self, message: str, exception: Optional[Exception] = None) -> Dict[str, str]:
         """Logs a critical error and returns an error dictionary for run_test_suite exit."""
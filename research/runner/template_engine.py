@@ -9,7 +9,10 @@ import logging
 import re
 import os
 import json
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Tuple
 
 # Local application imports
 from .config_loader import ConfigLoader # Assuming ConfigLoader is in the same directory
@@ -29,6 +32,16 @@ class TemplateEngine:
     # Regex updated slightly to include numbers, matching spec example
     VAR_PATTERN = re.compile(r'\[([a-zA-Z0-9_]+)\]')
 
+    # Heading of the constraint block by template type (default "CONSTRAINTS:")
+    CONSTRAINT_PREFIXES = {"validation": "VALIDATION CRITERIA:"}
+
+    # Substrings whose absence from an ASCII prompt means _optimize_tokens has nothing to do
+    # beyond strip(): the only whitespace left is single spaces and at most one blank line in a row
+    REDUNDANT_WHITESPACE_MARKERS = ('\t', '  ', '\n\n\n', '\n \n', '\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x1f')
+
+    # Maximum number of rendered prompts kept in the render cache
+    RENDER_CACHE_SIZE = 512
+
     def __init__(self, config_loader: ConfigLoader):
         """
         Initialize the TemplateEngine.
@@ -38,30 +51,180 @@ class TemplateEngine:
         """
         self.logger = logging.getLogger("edgeprompt.runner.template")
         self.config_loader = config_loader # Store ConfigLoader instance
+        # LRU cache of rendered prompts keyed by (template_name, frozen variables)
+        self._render_cache: "OrderedDict[Tuple[str, Any], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._render_cache_lock = threading.Lock()
+        self._render_cache_stats = {"hits": 0, "misses": 0}
+        # Per-template work that does not depend on variables (file load, placeholder scan,
+        # constraint text), keyed by template name
+        self._compiled_templates: Dict[str, Dict[str, Any]] = {}
+        # Parsed JSON schemas keyed by template type (empty dict if unavailable)
+        self._schema_cache: Dict[str, Dict[str, Any]] = {}
         self.logger.info("TemplateEngine initialized")
     
-    def process_template(self, template_name: str, variables: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    def process_template(self, template_name: str, variables: Mapping[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
         """
         Loads and processes a template according to the TemplateProcessing algorithm.
 
+        Rendering is deterministic on its inputs, so successful results are memoized
+        by template name and variable values (see clear_cache).
+
         Args:
             template_name: The name of the template to load (without .json extension).
-            variables: Dictionary of values to substitute into the template pattern.
+            variables: Mapping of values to substitute into the template pattern (any
+                read-only mapping works, e.g. a ChainMap layering overrides on defaults).
 
         Returns:
             A tuple containing:
             - processed_prompt (str | None): The fully processed prompt ready for LLM, or None on error.
             - metadata (Dict[str, Any]): Information about the processing (e.g., template_id, variables used).
         """
-        metadata = {"template_name": template_name, "variables_provided": list(variables.keys()), "processing_success": False}
-        self.logger.debug(f"Processing template: {template_name} with variables: {list(variables.keys())}")
+        cache_key = self._make_cache_key(template_name, variables)
+        if cache_key is not None:
+            with self._render_cache_lock:
+                cached = self._render_cache.get(cache_key)
+                if cached is not None:
+                    self._render_cache.move_to_end(cache_key)
+                self._render_cache_stats["misses" if cached is None else "hits"] += 1
+            if cached is not None:
+                self.logger.debug(f"Using cached render for template: {template_name}")
+                return cached[0], dict(cached[1])
+
+        processed_prompt, metadata = self._render_template(template_name, variables)
+
+        if cache_key is not None and processed_prompt is not None:
+            with self._render_cache_lock:
+                self._render_cache[cache_key] = (processed_prompt, dict(metadata))
+                if len(self._render_cache) > self.RENDER_CACHE_SIZE:
+                    self._render_cache.popitem(last=False)
+
+        return processed_prompt, metadata
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Report render cache usage since the last clear_cache.
+
+        Returns:
+            Dict with "hits", "misses" (cacheable calls only), "size" and "max_size".
+        """
+        with self._render_cache_lock:
+            return {
+                **self._render_cache_stats,
+                "size": len(self._render_cache),
+                "max_size": self.RENDER_CACHE_SIZE
+            }
+
+    def clear_cache(self) -> None:
+        """Clear the rendered prompt, compiled template and schema caches (e.g. between test suites)."""
+        with self._render_cache_lock:
+            self._render_cache.clear()
+            self._compiled_templates.clear()
+            self._schema_cache.clear()
+            self._render_cache_stats = {"hits": 0, "misses": 0}
+        self.logger.debug("Template render cache cleared")
+
+    def _get_compiled_template(self, template_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a template and precompute everything that does not depend on the variables.
+
+        Returns:
+            Dict with the template, its pattern split into substitution segments, the unique
+            variable names in pattern order ("variable_names"), its variable defaults and its
+            formatted constraint text, or None if the template could not be loaded. Templates
+            that fail basic validation are returned without the defaults and constraint text.
+        """
+        with self._render_cache_lock:
+            compiled = self._compiled_templates.get(template_name)
+        if compiled is not None:
+            return compiled
 
-        # Load template using ConfigLoader
         template = self.config_loader.load_template(template_name)
         if not template:
+            return None
+
+        compiled = {"template": template}
+        if isinstance(template.get("pattern"), str):
+            # Literal/placeholder segments and the unique placeholder names in pattern order,
+            # scanned once per template load
+            compiled["segments"], compiled["pattern_tail"] = self._compile_pattern(template["pattern"])
+            compiled["variable_names"] = tuple(dict.fromkeys(var_name for _, var_name in compiled["segments"]))
+        if all(k in template for k in ['id', 'pattern', 'type']):
+            # Constraint encoding only depends on the template's constraints/answerSpace
+            constraint_data = {
+                "explicit_list": template.get("constraints", []),
+                **template.get("answerSpace", {}) # Merge answerSpace dict into constraint data
+            }
+            compiled["constraint_text"] = self._format_constraints(constraint_data, template["type"])
+            # Defaults for pattern variables, as the strings substituted; dict entries are variable
+            # definitions, not defaults (kept for backward compatibility), and default to an empty string
+            template_vars = template.get("variables", {})
+            compiled["variable_defaults"] = {
+                var_name: "" if isinstance(default_value, dict) else str(default_value)
+                for var_name, default_value in (template_vars.items() if isinstance(template_vars, dict) else ())
+            }
+
+        with self._render_cache_lock:
+            compiled = self._compiled_templates.setdefault(template_name, compiled)
+        return compiled
+
+    @classmethod
+    def _compile_pattern(cls, pattern: str) -> Tuple[Tuple[Tuple[str, str], ...], str]:
+        """
+        Split a template pattern into substitution segments, so rendering needs no regex.
+
+        Args:
+            pattern: Template pattern with [variable] placeholders.
+
+        Returns:
+            A tuple of (literal text preceding the placeholder, variable name) pairs in
+            pattern order, and the literal text after the last placeholder.
+        """
+        segments = []
+        position = 0
+        for match in cls.VAR_PATTERN.finditer(pattern):
+            segments.append((pattern[position:match.start()], match.group(1)))
+            position = match.end()
+        return tuple(segments), pattern[position:]
+
+    @classmethod
+    def _freeze(cls, value: Any) -> Any:
+        """Convert a variable value into a hashable form that preserves its type."""
+        if isinstance(value, Mapping):
+            # Any mapping (dict, ChainMap, ...) freezes by its merged items
+            return ("dict", tuple(sorted((k, cls._freeze(v)) for k, v in value.items())))
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = tuple(cls._freeze(v) for v in value)
+            return (type(value).__name__, tuple(sorted(items)) if isinstance(value, (set, frozenset)) else items)
+        if isinstance(value, str):
+            return value
+        hash(value)
+        # Tag scalars with their type: 1, 1.0 and True compare equal but render differently
+        return (type(value).__name__, value)
+
+    def _make_cache_key(self, template_name: str, variables: Mapping[str, Any]) -> Optional[Tuple[str, Any]]:
+        """
+        Build the render cache key for a template call.
+
+        Returns:
+            A hashable key, or None if the variables cannot be frozen (the call is then not cached).
+        """
+        try:
+            return (template_name, self._freeze(variables))
+        except TypeError:
+            return None
+
+    def _render_template(self, template_name: str, variables: Mapping[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Uncached implementation of process_template."""
+        metadata = {"template_name": template_name, "variables_provided": list(variables.keys()), "processing_success": False}
+        self.logger.debug(f"Processing template: {template_name} with variables: {list(variables.keys())}")
+
+        # Load template using ConfigLoader (once per template name)
+        compiled = self._get_compiled_template(template_name)
+        if not compiled:
             self.logger.error(f"Failed to load template: {template_name}")
             metadata["error"] = f"Template '{template_name}' not loaded."
             return None, metadata
+        template = compiled["template"]
 
         template_id = template.get('id', template_name)
         metadata["template_id"] = template_id
@@ -76,71 +239,51 @@ class TemplateEngine:
             metadata["error"] = error_msg
             return None, metadata
 
-        pattern = template["pattern"]
         template_type = template["type"]
-        processed_prompt = pattern
 
         # 2-4. Variable Extraction & Substitution
-        template_vars = template.get("variables", {}) # Get template-defined variables and defaults
-        provided_vars = set(variables.keys())
-        found_vars_in_pattern = set(self.VAR_PATTERN.findall(pattern))
+        found_vars_in_pattern = compiled["variable_names"]
         metadata["variables_in_pattern"] = list(found_vars_in_pattern)
-        
-        # Track missing variables for debugging
-        missing_vars = []
-        
-        # First, use provided values where available
-        substitution_vars = {}  # The variables we'll actually use
-        
-        # For each variable found in the pattern...
-        for var_name in found_vars_in_pattern:
-            if var_name in provided_vars:
-                # Use the provided value
-                substitution_vars[var_name] = variables[var_name]
-            elif var_name in template_vars:
-                # Use the default value from template
-                default_value = template_vars.get(var_name, "")
-                # Handle if the default is a dict (for backward compatibility)
-                if isinstance(default_value, dict):
-                    default_value = ""
-                substitution_vars[var_name] = default_value
-                self.logger.debug(f"Variable '{var_name}' not provided, using default from template.")
-            else:
-                # No default available, use empty string and log warning
-                self.logger.warning(f"Variable '{var_name}' found in template '{template_id}' pattern but not provided. Substituting empty string.")
-                substitution_vars[var_name] = ""
-                missing_vars.append(var_name)
-        
-        # Add missing vars to metadata for debugging
-        if missing_vars:
-            metadata["missing_variables"] = missing_vars
-            
-        # Replace the original variables with our processed ones that include defaults
-        variables = substitution_vars
+        template_defaults = compiled["variable_defaults"]
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-        # Perform substitution
+        # Resolve each pattern variable once, as the string to substitute: the provided value
+        # where available, then the template's default, else an empty string
+        value_strs = {}  # The values we'll actually use
+        missing_vars = []  # Track missing variables (no value and no default) for debugging
         try:
             for var_name in found_vars_in_pattern:
-                value_str = str(variables.get(var_name, "")) # Default to empty string if somehow still missing
-                placeholder = f"[{var_name}]"
-                processed_prompt = processed_prompt.replace(placeholder, value_str)
+                if var_name in variables:
+                    value = variables[var_name]
+                    # Values are almost always str already; skip the str() call for those
+                    value_strs[var_name] = value if type(value) is str else str(value)
+                elif var_name in template_defaults:
+                    value_strs[var_name] = template_defaults[var_name]
+                    if debug_enabled:
+                        self.logger.debug(f"Variable '{var_name}' not provided, using default from template.")
+                else:
+                    self.logger.warning(f"Variable '{var_name}' found in template '{template_id}' pattern but not provided. Substituting empty string.")
+                    value_strs[var_name] = ""
+                    missing_vars.append(var_name)
+
+            # Perform substitution in a single pass over the pattern; substituted values are
+            # never rescanned, so a value containing "[name]" is inserted verbatim
+            processed_prompt = "".join([
+                literal + value_strs[var_name] for literal, var_name in compiled["segments"]
+            ]) + compiled["pattern_tail"]
         except Exception as e:
             error_msg = f"Error during variable substitution for template {template_id}: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             metadata["error"] = error_msg
             return None, metadata
 
+        # Add missing vars to metadata for debugging
+        if missing_vars:
+            metadata["missing_variables"] = missing_vars
+
         # 5. Apply explicit constraint encoding
-        #    (Using data from `constraints` or `answerSpace` fields in the template)
-        constraints_list = template.get("constraints", [])
-        answer_space = template.get("answerSpace", {})
-        # Combine high-level constraints with specific answerSpace details
-        constraint_data = {
-            "explicit_list": constraints_list,
-            **answer_space # Merge answerSpace dict into constraint data
-        }
-        formatted_constraint_text = self._format_constraints(constraint_data, template_type)
-        processed_prompt = self._apply_constraints(processed_prompt, formatted_constraint_text, template_type)
+        #    (Constraint text is built from the template's `constraints`/`answerSpace` when compiled)
+        processed_prompt = self._apply_constraints(processed_prompt, compiled["constraint_text"], template_type)
 
         # 6. Perform basic token efficiency optimization
         processed_prompt = self._optimize_tokens(processed_prompt)
@@ -164,42 +307,39 @@ class TemplateEngine:
         Returns:
             A formatted string representing the constraints for the prompt.
         """
-        lines = []
         # Add explicit constraints first
-        explicit_list = constraint_data.get("explicit_list", [])
-        if explicit_list:
-             lines.extend(explicit_list)
+        lines = list(constraint_data.get("explicit_list", []))
 
         # Add specific constraints from answerSpace
-        if constraint_data.get("minWords") is not None and constraint_data.get("maxWords") is not None:
-             lines.append(f"Content length must be between {constraint_data['minWords']} and {constraint_data['maxWords']} words.")
-        elif constraint_data.get("maxWords") is not None:
-             lines.append(f"Content length must be maximum {constraint_data['maxWords']} words.")
-
-        if constraint_data.get("vocabulary"):
-             lines.append(f"Vocabulary must be suitable for: {constraint_data['vocabulary']}.")
-        if constraint_data.get("structure"):
-             lines.append(f"Use structure: {constraint_data['structure']}.")
-        if constraint_data.get("prohibitedContent"):
-             prohibited_str = ", ".join(constraint_data["prohibitedContent"])
-             lines.append(f"Avoid prohibited content types/topics: {prohibited_str}.")
+        min_words = constraint_data.get("minWords")
+        max_words = constraint_data.get("maxWords")
+        if min_words is not None and max_words is not None:
+             lines.append(f"Content length must be between {min_words} and {max_words} words.")
+        elif max_words is not None:
+             lines.append(f"Content length must be maximum {max_words} words.")
+
+        vocabulary = constraint_data.get("vocabulary")
+        if vocabulary:
+             lines.append(f"Vocabulary must be suitable for: {vocabulary}.")
+        structure = constraint_data.get("structure")
+        if structure:
+             lines.append(f"Use structure: {structure}.")
+        prohibited_content = constraint_data.get("prohibitedContent")
+        if prohibited_content:
+             lines.append(f"Avoid prohibited content types/topics: {', '.join(prohibited_content)}.")
 
         # Add any other key-value pairs from answerSpace.other or top-level
-        other_constraints = constraint_data.get("other", {})
-        for key, value in other_constraints.items():
-             lines.append(f"{key.replace('_', ' ').capitalize()}: {value}")
+        lines.extend(
+            f"{key.replace('_', ' ').capitalize()}: {value}"
+            for key, value in constraint_data.get("other", {}).items()
+        )
 
         if not lines:
             return ""
 
-        # Add prefix based on type
-        prefix = "CONSTRAINTS:"
-        if template_type == "validation":
-            prefix = "VALIDATION CRITERIA:"
-
-        # Combine lines with bullet points
-        formatted_lines = "\n- ".join(lines)
-        return f"{prefix}\n- {formatted_lines}"
+        # Add prefix based on type and combine lines with bullet points
+        prefix = self.CONSTRAINT_PREFIXES.get(template_type, "CONSTRAINTS:")
+        return f"{prefix}\n- " + "\n- ".join(lines)
     
     def _apply_constraints(self, processed: str, constraint_text: str, template_type: str) -> str:
         """
@@ -225,11 +365,30 @@ class TemplateEngine:
         """
         Perform basic token optimization (whitespace reduction).
         """
-        # 1. Eliminate redundant whitespace (multiple spaces/newlines)
-        optimized = re.sub(r'[ \t]+', ' ', text) # Replace multiple spaces/tabs with single space
-        optimized = re.sub(r'\n\s*\n', '\n\n', optimized) # Replace multiple newlines with double newline
-        optimized = optimized.strip() # Remove leading/trailing whitespace
-        return optimized
+        # Fast path: hand-authored templates rarely contain redundant whitespace
+        if text.isascii() and not any(marker in text for marker in self.REDUNDANT_WHITESPACE_MARKERS):
+            return text.strip()
+
+        # 1. Eliminate redundant whitespace (multiple spaces/newlines) line by line with
+        #    str methods; equivalent to re.sub(r'[ \t]+', ' ') then re.sub(r'\n\s*\n', '\n\n').
+        #    Tabs are mapped to spaces with one str.replace over the whole text (cheaper than
+        #    str.translate or a per-line replace)
+        lines = []
+        previous_blank = False
+        for line in text.replace('\t', ' ').split('\n'):
+            if not line or line.isspace():
+                # Runs of whitespace-only lines collapse into a single empty line
+                if not previous_blank:
+                    lines.append('')
+                previous_blank = True
+                continue
+            previous_blank = False
+            if '  ' in line:
+                # Replace multiple spaces with a single space, keeping one leading/trailing space
+                collapsed = ' '.join(filter(None, line.split(' ')))
+                line = (' ' if line[0] == ' ' else '') + collapsed + (' ' if line[-1] == ' ' else '')
+            lines.append(line)
+        return '\n'.join(lines).strip() # Remove leading/trailing whitespace
         
     def preprocess_template_variables(self, template_name: str, variables: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -242,18 +401,18 @@ class TemplateEngine:
         Returns:
             Dict with preprocessed variables including default values
         """
-        # Load the template
-        template = self.config_loader.load_template(template_name)
-        if not template:
+        # Load the template (cached along with its placeholders)
+        compiled = self._get_compiled_template(template_name)
+        if not compiled:
             self.logger.error(f"Failed to load template: {template_name} for preprocessing")
             return variables
+        template = compiled["template"]
         
         template_id = template.get('id', template_name)
         processed_vars = variables.copy()
         
         # Check which variables are needed in the pattern
-        pattern = template.get("pattern", "")
-        needed_vars = set(self.VAR_PATTERN.findall(pattern))
+        needed_vars = compiled.get("variable_names", ())
         
         # Get default values
         default_values = template.get("defaultValues", {})
@@ -282,7 +441,7 @@ class TemplateEngine:
             
         return processed_vars
     
-    def extract_template_variables(self, template_name: str) -> List[str]:
+    def extract_template_variables(self, template_name: str) -> Tuple[str, ...]:
         """
         Loads a template and extracts all variable placeholders (e.g., [variable_name]).
 
@@ -290,26 +449,38 @@ class TemplateEngine:
             template_name: The name of the template to load.
 
         Returns:
-            List of variable names found in the template's pattern, or empty list on error.
+            Tuple of the unique variable names in the template's pattern, in order of first
+            appearance (cached per template), or an empty tuple on error.
         """
-        template = self.config_loader.load_template(template_name)
-        if not template or 'pattern' not in template:
+        compiled = self._get_compiled_template(template_name)
+        if not compiled or "variable_names" not in compiled:
              self.logger.error(f"Cannot extract variables: Failed to load or invalid pattern for template {template_name}")
-             return []
+             return ()
 
-        pattern = template.get('pattern', '')
-        return self.VAR_PATTERN.findall(pattern)
+        return compiled["variable_names"]
 
     def get_template_schema(self, template_type: str) -> Dict[str, Any]:
         """
-        Get the JSON schema for a template type.
+        Get the JSON schema for a template type. Schemas are read once and cached
+        until clear_cache.
         
         Args:
             template_type: Type of template
             
         Returns:
-            JSON schema dict for validation
+            JSON schema dict for validation (shared by callers; do not modify)
         """
+        with self._render_cache_lock:
+            cached = self._schema_cache.get(template_type)
+        if cached is not None:
+            return cached
+
+        schema = self._load_template_schema(template_type)
+        with self._render_cache_lock:
+            return self._schema_cache.setdefault(template_type, schema)
+
+    def _load_template_schema(self, template_type: str) -> Dict[str, Any]:
+        """Uncached implementation of get_template_schema."""
         schema_paths = {
             "question_generation": "schemas/teacher_input_template_schema.json",
             "validation": "schemas/validation_sequence_schema.json",
@@ -16,9 +16,27 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path to enable imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+def json_loads(text):
+    """
+    Parse one JSON document, using orjson when it is installed.
+    Documents orjson rejects (e.g. NaN values written by json.dumps) are retried with json.loads,
+    so invalid JSON raises json.JSONDecodeError either way.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
     """Configure logging for the analyzer"""
     log_level_map = {
@@ -59,7 +77,7 @@ def load_results(data_dir: str, logger: logging.Logger) -> pd.DataFrame:
         with open(jsonl_path, 'r') as f:
             for line in f:
                 try:
-                    results.append(json.loads(line))
+                    results.append(json_loads(line))
                 except json.JSONDecodeError:
                     logger.warning(f"Skipping invalid JSON line in {jsonl_path}")
                     
@@ -81,7 +99,7 @@ def load_results(data_dir: str, logger: logging.Logger) -> pd.DataFrame:
                 elif item.endswith('.json'):
                     try:
                         with open(full_path, 'r') as f:
-                            data = json.load(f)
+                            data = json_loads(f.read())
                             # Only add result files that have the expected structure
                             if isinstance(data, dict) and any(key in data for key in ['id', 'test_case_id', 'model_id']):
                                 # Add test_suite_id if missing by inferring from path
@@ -143,11 +161,11 @@ def analyze_four_run_comparison(df: pd.DataFrame, output_dir: str, logger: loggi
          try:
              # Check if columns contain dicts or potentially JSON strings
              if isinstance(df['run_1'].iloc[0], str):
-                  df['run_1'] = df['run_1'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+                  df['run_1'] = df['run_1'].apply(lambda x: json_loads(x) if isinstance(x, str) else x)
              if isinstance(df['run_3'].iloc[0], str):
-                  df['run_3'] = df['run_3'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+                  df['run_3'] = df['run_3'].apply(lambda x: json_loads(x) if isinstance(x, str) else x)
              if isinstance(df['run_4'].iloc[0], str):
-                  df['run_4'] = df['run_4'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+                  df['run_4'] = df['run_4'].apply(lambda x: json_loads(x) if isinstance(x, str) else x)
 
              # Normalize nested data
              four_run_df = pd.json_normalize(df.to_dict('records'), sep='.')
@@ -384,42 +402,19 @@ def analyze_four_run_comparison(df: pd.DataFrame, output_dir: str, logger: loggi
             union = words_a.union(words_b)
             return len(intersection) / len(union) if union else 0
         
-        # Calculate similarity scores between outputs
-        output_run1 = detailed_df['output_run1'].tolist()
-        output_run3 = detailed_df['output_run3'].tolist()
-        output_run4 = detailed_df['output_run4'].tolist()
+        # Score every row once, then average per group in a single groupby reduction
+        similarity_df = detailed_df[valid_grouping_factors].copy()
+        similarity_df['agreement_score_run3_vs_ref'] = [
+            basic_similarity(run3, run1) for run3, run1 in zip(detailed_df['output_run3'], detailed_df['output_run1'])
+        ]
+        similarity_df['agreement_score_run4_vs_ref'] = [
+            basic_similarity(run4, run1) for run4, run1 in zip(detailed_df['output_run4'], detailed_df['output_run1'])
+        ]
         
         # Calculate average similarity for each group
         # This is just a placeholder - actual implementation would be more sophisticated
-        quality_by_group = {}
-        for idx, group in enumerate(detailed_df.groupby(valid_grouping_factors).groups):
-            group_indices = detailed_df.groupby(valid_grouping_factors).groups[group]
-            run3_vs_run1_scores = []
-            run4_vs_run1_scores = []
-            
-            for i in group_indices:
-                run3_vs_run1 = basic_similarity(output_run3[i], output_run1[i])
-                run4_vs_run1 = basic_similarity(output_run4[i], output_run1[i])
-                run3_vs_run1_scores.append(run3_vs_run1)
-                run4_vs_run1_scores.append(run4_vs_run1)
-            
-            quality_by_group[group] = {
-                'agreement_score_run3_vs_ref': sum(run3_vs_run1_scores) / len(run3_vs_run1_scores) if run3_vs_run1_scores else 0,
-                'agreement_score_run4_vs_ref': sum(run4_vs_run1_scores) / len(run4_vs_run1_scores) if run4_vs_run1_scores else 0
-            }
-        
-        # Create dataframe from quality scores
-        quality_data = []
-        for group, scores in quality_by_group.items():
-            if isinstance(group, tuple):
-                row = dict(zip(valid_grouping_factors, group))
-            else:
-                row = {valid_grouping_factors[0]: group}
-            row.update(scores)
-            row['agreement_diff_run4_vs_run3'] = row['agreement_score_run4_vs_ref'] - row['agreement_score_run3_vs_ref']
-            quality_data.append(row)
-        
-        quality_df = pd.DataFrame(quality_data)
+        quality_df = similarity_df.groupby(valid_grouping_factors).mean().reset_index()
+        quality_df['agreement_diff_run4_vs_run3'] = quality_df['agreement_score_run4_vs_ref'] - quality_df['agreement_score_run3_vs_ref']
         
         quality_file = os.path.join(output_dir, 'quality_vs_reference.csv')
         quality_df.to_csv(quality_file, index=False, float_format='%.4f')
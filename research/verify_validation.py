@@ -9,6 +9,7 @@ Validates core functionality works as intended:
 
 import json
 import logging
+import re
 import sys
 import os
 from runner.template_engine import TemplateEngine
@@ -26,10 +27,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger("validation_verification")
 
+# JSON in a markdown code block (```json ... ```), and a bare JSON object (one nesting level)
+CODE_BLOCK_JSON_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+BARE_JSON_OBJECT_RE = re.compile(r'\{(?:[^{}]|(?:\{[^{}]*\}))*\}', re.DOTALL)
+
 def verify_json_processing():
     """Verify JSON processing from LLM responses with various formats"""
     from runner.runner_core import RunnerCore
-    import re
     
     # Sample LLM outputs in various formats
     test_responses = [
@@ -95,7 +99,7 @@ def verify_json_processing():
                 # If direct parsing fails, try to extract JSON from markdown code blocks
                 try:
                     # Look for JSON in markdown code blocks (```json ... ```)
-                    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
+                    json_match = CODE_BLOCK_JSON_RE.search(response)
                     if json_match:
                         json_text = json_match.group(1)
                         logger.info(f"Found JSON in markdown code block")
@@ -104,7 +108,7 @@ def verify_json_processing():
                         continue
                     
                     # Look for JSON objects without code blocks if not found in code blocks
-                    json_match = re.search(r'\{(?:[^{}]|(?:\{[^{}]*\}))*\}', response, re.DOTALL)
+                    json_match = BARE_JSON_OBJECT_RE.search(response)
                     if json_match:
                         json_text = json_match.group(0)
                         logger.info(f"Found JSON object in text")